@@ -1,4 +1,9 @@
 import pygame, sys
+from pose_estimator import preload_pose_estimator, shutdown_pose_estimator
+from screens.screen_registry import ScreenRegistry
+from ui.frame_source import shutdown_frame_source
+from ui.perf_hud import PerfHud
+from ui.perf_monitor import perf
 from screens.title_screen import TitleScreen
 from screens.stage_select import StageSelect
 from screens.jungle_stages.jungle_intro import JungleIntro
@@ -17,36 +22,89 @@ screen_width, screen_height = info.current_w - 50, info.current_h - 100
 screen = pygame.display.set_mode((screen_height, screen_height))
 
 clock = pygame.time.Clock()
+IDLE_TIMEOUT_MS = 250  # an idle screen still gets a draw() this often, for slow changes like loading progress
+REDRAW_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
 
-# Screen manager
-screens = {
-    "title": TitleScreen(screen),
-    "stage_select": StageSelect(screen),
-    "jungle_intro": JungleIntro(screen),
-    "jungle_selector": JungleSelector(screen),
-    "animal_march_intro": AnimalMarchIntro(screen),
-    "animal_march_camera":AnimalMarchCamera(screen),
-    "tree_pose_intro": TreePoseIntro(screen),  
-    "tree_pose_camera": TreePoseCamera(screen),
-    "river_crossing_intro": RiverCrossingIntro(screen),
-    "river_crossing_camera": RiverCrossingCamera(screen)
-}
+# Load and warm up the pose model in the background while the title screen is up
+preload_pose_estimator()
+
+# Screen manager: screens are built on first visit, camera screens are
+# evicted when the user leaves their mini-game
+screens = ScreenRegistry(screen)
+screens.register("title", TitleScreen, next_screen="stage_select")
+screens.register("stage_select", StageSelect, next_screen="jungle_intro")
+screens.register("jungle_intro", JungleIntro, next_screen="jungle_selector")
+screens.register("jungle_selector", JungleSelector)
+screens.register("animal_march_intro", AnimalMarchIntro, group="animal_march", next_screen="animal_march_camera")
+screens.register("animal_march_camera", AnimalMarchCamera, group="animal_march", evictable=True)
+screens.register("tree_pose_intro", TreePoseIntro, group="tree_pose", next_screen="tree_pose_camera")
+screens.register("tree_pose_camera", TreePoseCamera, group="tree_pose", evictable=True)
+screens.register("river_crossing_intro", RiverCrossingIntro, group="river_crossing", next_screen="river_crossing_camera")
+screens.register("river_crossing_camera", RiverCrossingCamera, group="river_crossing", evictable=True)
 current_screen = "title"
 
+# Performance page on top of every screen, toggled with 'P'
+perf_hud = PerfHud(screen)
+
+def invalidate(name):
+    """Make a screen repaint fully on its next draw() (screens that always repaint need nothing)"""
+    screen_obj = screens.get(name)
+    if hasattr(screen_obj, "invalidate"):
+        screen_obj.invalidate()
+
+# draw() returns None (whole screen changed), [] (nothing changed) or a list
+# of changed rects. While the screen is idle the loop sleeps in event.wait()
+# instead of redrawing at 30 fps, so a kiosk left on a menu uses almost no CPU.
+idle = False
 running = True
 while running:
+    if idle:
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        events = ([event] if event.type != pygame.NOEVENT else []) + pygame.event.get()
+    else:
+        events = pygame.event.get()
     mouse_pos = pygame.mouse.get_pos()
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            perf_hud.toggle()
+            invalidate(current_screen)  # remove or redraw the panel
+        elif event.type in REDRAW_EVENTS:
+            invalidate(current_screen)
         else:
-            result = screens[current_screen].handle_event(event, mouse_pos)
+            result = screens.get(current_screen).handle_event(event, mouse_pos)
             if result and result in screens:
+                screens.switch(current_screen, result)
                 current_screen = result
+                invalidate(current_screen)
 
-    screens[current_screen].draw()
-    pygame.display.update()
+    # The translucent perf panel must be drawn over a fresh picture every time
+    if perf_hud.visible:
+        invalidate(current_screen)
+
+    with perf.stage("draw"):
+        dirty = screens.get(current_screen).draw()
+    if dirty is None:
+        perf_hud.draw()
+        with perf.stage("display_flip"):
+            pygame.display.update()
+    elif dirty:
+        with perf.stage("display_flip"):
+            pygame.display.update(dirty)
+    idle = dirty == []
+    if not idle:
+        perf.tick("render")
+
+    # Nothing happened this frame: use the slack to build the likely next screen
+    if not events:
+        screens.prefetch_next(current_screen)
     clock.tick(30)
 
+screens.close_all()
+shutdown_frame_source()
+shutdown_pose_estimator()
+perf.dump()  # per-stage timings of this session when MOVEQUEST_PERF_DIR is set
+
 pygame.quit()
 sys.exit()
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+import pygame
+
+MEMORY_BUDGET_MB = int(os.environ.get("MOVEQUEST_ASSET_BUDGET_MB", "192"))  # decoded + scaled pixels kept cached
+FILTERS = {
+    "smooth": pygame.transform.smoothscale,
+    "fast": pygame.transform.scale,
+}
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetManager:
+    """
+    Decodes every image file once and hands out shared Surfaces, plus scaled
+    variants keyed by (path, size, filter), so screens that use the same
+    picture (the win overlay, buttons, fruits) share one copy and a screen
+    rebuilt after eviction does not decode or rescale again.
+
+    Originals and variants live in one LRU; when the cached pixels exceed the
+    memory budget the least recently used entries are dropped from the cache
+    (screens still holding a Surface keep it alive) and rebuilt on demand.
+    Returned Surfaces are shared: blit them, never draw into them.
+
+    Screens are also built on prefetch threads, so decoding and scaling happen
+    outside the lock and only the cache bookkeeping is serialized.
+    """
+
+    def __init__(self, budget_mb=MEMORY_BUDGET_MB):
+        self.budget = budget_mb * 1024 * 1024
+        self._cache = OrderedDict()  # key -> Surface, least recently used first
+        self._bytes = 0
+        self._listings = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        with self._lock:
+            surface = self._cache.get(key)
+            if surface is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return surface
+
+    def _put(self, key, surface):
+        with self._lock:
+            existing = self._cache.get(key)
+            if existing is not None:  # another thread built it meanwhile
+                return existing
+            self.misses += 1
+            self._cache[key] = surface
+            self._bytes += surface_bytes(surface)
+            while self._bytes > self.budget and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= surface_bytes(evicted)
+                self.evictions += 1
+            return surface
+
+    def image(self, path, alpha=True):
+        """The decoded image, converted for fast blitting (convert_alpha, or convert for opaque images)"""
+        key = (path, None, None, alpha)
+        surface = self._get(key)
+        if surface is None:
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            surface = self._put(key, surface)
+        return surface
+
+    def scaled(self, path, size, filter="smooth", alpha=True):
+        """The image scaled to `size` with the "smooth" or "fast" filter"""
+        size = (int(size[0]), int(size[1]))
+        key = (path, size, filter, alpha)
+        surface = self._get(key)
+        if surface is None:
+            original = self.image(path, alpha)
+            if original.get_size() == size:
+                return original
+            surface = self._put(key, FILTERS[filter](original, size))
+        return surface
+
+    def files(self, folder, extension=".png"):
+        """Sorted image paths in a folder, listed once"""
+        key = (folder, extension)
+        with self._lock:
+            paths = self._listings.get(key)
+        if paths is None:
+            paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(extension))
+            with self._lock:
+                self._listings[key] = paths
+        return paths
+
+    def memory_usage(self):
+        """Pixel memory held by the cache: {"bytes", "entries", "budget", "hits", "misses", "evictions"}"""
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "entries": len(self._cache),
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+
+# One asset cache for the whole app
+assets = AssetManager()
+
+def load_image(path, alpha=True):
+    return assets.image(path, alpha)
+
+def scaled_image(path, size, filter="smooth", alpha=True):
+    return assets.scaled(path, size, filter, alpha)
@@ -1,5 +1,6 @@
 import pygame
 import os
+import threading
 
 pygame.font.init()
 
@@ -7,14 +8,32 @@ pygame.font.init()
 BASE_DIR = os.path.dirname(__file__)
 DYNAPUFF_PATH = os.path.join(BASE_DIR, "DynaPuff-VariableFont_wdth,wght.ttf")
 
+# Loaded fonts, keyed by (path, size, bold, italic). Opening a TTF is slow,
+# so every screen and HUD shares one Font per style; callers must not change
+# the style of a returned Font (ask for bold/italic instead).
+_fonts = {}
+_fonts_lock = threading.Lock()  # screens are also built on prefetch threads
+
+def _cached_font(path, size, bold, italic):
+    key = (path, size, bold, italic)
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+            _fonts[key] = font
+        return font
+
 def dynapuff(size, bold=False, italic=False):
     """
-    Returns a pygame Font object for DynaPuff
+    Returns a pygame Font object for DynaPuff, loaded once per style
     size: font size
     bold: make font bold (if supported)
     italic: make font italic (if supported)
     """
-    font = pygame.font.Font(DYNAPUFF_PATH, size)
-    font.set_bold(bold)
-    font.set_italic(italic)
-    return font
+    return _cached_font(DYNAPUFF_PATH, size, bold, italic)
+
+def default_font(size, bold=False, italic=False):
+    """pygame's built-in font (used by the debug overlays), loaded once per style"""
+    return _cached_font(None, size, bold, italic)
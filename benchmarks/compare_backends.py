@@ -0,0 +1,133 @@
+"""
+Accuracy vs. speed of the pose backends on the same recorded frames, with
+the PyTorch backend as the reference. From the repository root:
+
+    python -m benchmarks.compare_backends clip.mp4
+    python -m benchmarks.compare_backends frames_dir/ --backends onnx,onnx-int8 --frames 200
+
+The source is a video file or a folder of images (see ui/frame_source.py);
+"synthetic" works without any files but only exercises the code paths.
+For each backend prints p50/p95 latency and, against the reference, how
+often the number of people agrees and the joint position error in pixels
+(joints confident in both) and as a fraction of the person's height.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from benchmarks.harness import Benchmark, measure
+from pose_estimator import INFERENCE_SIZE, PoseEstimator, keypoint_boxes
+from pose_tracker import box_iou
+from ui.frame_source import SyntheticSource, VideoFileSource
+
+BACKENDS = ("local", "onnx", "onnx-int8", "openvino", "openvino-int8")
+JOINT_CONFIDENCE = 0.5   # joints below this in either result are not compared
+MATCH_IOU = 0.3          # people whose boxes overlap less than this are not the same person
+
+
+def load_frames(spec, count):
+    """Up to `count` frames from a video file, image folder or "synthetic", read as fast as possible"""
+    if spec == "synthetic":
+        source = SyntheticSource(realtime=False)
+    else:
+        source = VideoFileSource(spec, loop=False, realtime=False)
+    if not source.open():
+        raise SystemExit(f"Cannot open {spec}")
+    frames = []
+    while len(frames) < count:
+        ok, frame, _ = source.read()
+        if not ok:
+            break
+        frames.append(frame)
+    source.release()
+    return frames
+
+
+def run_backend(name, frames, imgsz):
+    """Time one backend over the frames; returns (timing, per-frame keypoints)."""
+    backend, _, variant = name.partition("-")
+    outputs = [None] * len(frames)
+
+    def setup():
+        estimator = PoseEstimator(backend=backend, imgsz=imgsz, roi=False, int8=variant == "int8")
+        if estimator.backend != backend:
+            estimator.close()
+            raise RuntimeError(f"{backend} runtime not installed")
+        estimator.warm_up()
+
+        def step(i):
+            outputs[i % len(frames)] = estimator.detect(frames[i % len(frames)])[1]
+        return step, estimator.close
+
+    timing = measure(Benchmark(name, setup, iterations=len(frames), warmup=0))
+    return timing, outputs
+
+
+def compare_keypoints(reference, outputs):
+    """Agreement with the reference keypoints over all frames"""
+    same_count = 0
+    errors, relative = [], []
+    for ref, kp in zip(reference, outputs):
+        same_count += len(ref) == len(kp)
+        if len(ref) == 0 or len(kp) == 0:
+            continue
+        ref_boxes, boxes = keypoint_boxes(ref), keypoint_boxes(kp)
+        iou = box_iou(ref_boxes, boxes)
+        for r in range(len(ref)):
+            k = int(iou[r].argmax())
+            if iou[r, k] < MATCH_IOU:
+                continue
+            both = (ref[r, :, 2] >= JOINT_CONFIDENCE) & (kp[k, :, 2] >= JOINT_CONFIDENCE)
+            distance = np.linalg.norm(ref[r, both, :2] - kp[k, both, :2], axis=1)
+            height = max(ref_boxes[r, 3] - ref_boxes[r, 1], 1.0)
+            errors.extend(distance)
+            relative.extend(distance / height)
+    errors = np.asarray(errors) if errors else np.zeros(1)
+    relative = np.asarray(relative) if relative else np.zeros(1)
+    return {
+        "count_agreement": same_count / max(len(reference), 1),
+        "mean_error_px": float(errors.mean()),
+        "p95_error_px": float(np.percentile(errors, 95)),
+        "mean_error_height": float(relative.mean()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pose backends against PyTorch")
+    parser.add_argument("source", nargs="?", default="synthetic", help="video file, image folder or 'synthetic'")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_SIZE)
+    parser.add_argument("--backends", default=",".join(BACKENDS[1:]),
+                        help="comma-separated, from: " + ", ".join(BACKENDS))
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.source, args.frames)
+    print(f"{len(frames)} frames from {args.source} at {args.imgsz}px\n")
+
+    reference_timing, reference = run_backend("local", frames, args.imgsz)
+    print(f"{'backend':16s}{'p50 ms':>9s}{'p95 ms':>9s}{'speedup':>9s}{'count':>8s}{'err px':>9s}{'p95 px':>9s}{'err/h':>8s}")
+    print(f"{'local':16s}{reference_timing['p50_ms']:9.2f}{reference_timing['p95_ms']:9.2f}{1.0:9.2f}  (reference)")
+
+    for name in args.backends.split(","):
+        if name == "local":
+            continue
+        try:
+            timing, outputs = run_backend(name, frames, args.imgsz)
+        except Exception as e:
+            print(f"{name:16s} skipped ({type(e).__name__}: {e})")
+            continue
+        accuracy = compare_keypoints(reference, outputs)
+        print(f"{name:16s}{timing['p50_ms']:9.2f}{timing['p95_ms']:9.2f}"
+              f"{reference_timing['p50_ms'] / timing['p50_ms']:9.2f}{accuracy['count_agreement']:8.0%}"
+              f"{accuracy['mean_error_px']:9.2f}{accuracy['p95_error_px']:9.2f}{accuracy['mean_error_height']:8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import json
+import platform
+import time
+import numpy as np
+
+REGRESSION_THRESHOLD = 0.2   # flag a case when p50 or p95 is this much slower than the baseline
+
+
+class Benchmark:
+    """
+    One timed hot path. `setup()` builds whatever the case needs and returns
+    the callable to time, or (callable, cleanup). The callable takes the
+    iteration number, so cases can cycle through prepared inputs without
+    allocating in the timed region.
+    """
+
+    def __init__(self, name, setup, iterations=200, warmup=10):
+        self.name = name
+        self.setup = setup
+        self.iterations = iterations
+        self.warmup = warmup
+
+
+def measure(benchmark, scale=1.0):
+    """Run one benchmark and return its latency percentiles (ms) and throughput (calls/s)."""
+    fn = benchmark.setup()
+    fn, cleanup = fn if isinstance(fn, tuple) else (fn, None)
+    iterations = max(1, int(benchmark.iterations * scale))
+    try:
+        for i in range(benchmark.warmup):
+            fn(i)
+
+        samples = np.empty(iterations, dtype=np.float64)
+        for i in range(iterations):
+            start = time.perf_counter()
+            fn(i)
+            samples[i] = time.perf_counter() - start
+    finally:
+        if cleanup is not None:
+            cleanup()
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "throughput": float(iterations / samples.sum()),
+    }
+
+
+def environment():
+    """What the numbers were measured on, stored alongside a baseline"""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "numpy": np.__version__,
+    }
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Returns {name: (ratio_p50, ratio_p95, regressed)} for cases present in
+    both runs; a ratio above 1 means slower than the baseline.
+    """
+    report = {}
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or "p50_ms" not in current:
+            continue
+        ratio_p50 = current["p50_ms"] / max(base["p50_ms"], 1e-9)
+        ratio_p95 = current["p95_ms"] / max(base["p95_ms"], 1e-9)
+        report[name] = (ratio_p50, ratio_p95, max(ratio_p50, ratio_p95) > 1.0 + threshold)
+    return report
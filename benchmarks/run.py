@@ -0,0 +1,253 @@
+"""
+Benchmarks for every per-frame hot path, runnable without a camera or a
+display (synthetic frames, SDL dummy driver). From the repository root:
+
+    python -m benchmarks.run                  # run all, compare with the baseline
+    python -m benchmarks.run -k game          # only cases whose name contains "game"
+    python -m benchmarks.run --save-baseline  # store these numbers as the new baseline
+
+Reports p50/p95/p99 latency and throughput per case and exits with status 1
+when a case is slower than the baseline by more than --threshold.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)  # assets are loaded with paths relative to the repository root
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from benchmarks.harness import Benchmark, REGRESSION_THRESHOLD, compare, load_baseline, measure, save_baseline
+from ui.frame_source import SYNTHETIC_POSE, SyntheticSource
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+SCREEN_SIZE = (800, 800)
+FRAME_SIZE = (640, 480)          # typical webcam capture
+FRAME_RATE = 30.0
+DETECT_SIZES = (256, 320, 416, 640)
+
+def synthetic_frames(count=4, size=FRAME_SIZE):
+    """Camera-like BGR frames from the synthetic frame source"""
+    source = SyntheticSource(size, FRAME_RATE, realtime=False)
+    source.open()
+    return [source.read()[1] for _ in range(count)]
+
+
+def synthetic_poses(count=60, people=1):
+    """
+    (N, 17, 3) keypoint arrays of people marching in place: the knees take
+    turns lifting every 10 frames, with a little jitter on every joint
+    """
+    rng = np.random.default_rng(1)
+    poses = []
+    for i in range(count):
+        kp = np.empty((people, 17, 3), dtype=np.float32)
+        for p in range(people):
+            kp[p, :, :2] = SYNTHETIC_POSE + (p * 200 - (people - 1) * 100, 0)
+        lifted = 13 + (i // 10) % 2
+        kp[:, lifted, 1] -= 60
+        kp[:, lifted + 2, 1] -= 60
+        kp[..., :2] += rng.normal(0, 1.5, (people, 17, 2))
+        kp[..., 2] = 0.9
+        poses.append(kp)
+    return poses
+
+
+def timestamp(i):
+    return 1000.0 + i / FRAME_RATE
+
+
+# -------------------- Cases --------------------
+def detect_case(imgsz):
+    def setup():
+        from pose_estimator import PoseEstimator
+        estimator = PoseEstimator(imgsz=imgsz, roi=False)
+        frames = synthetic_frames()
+        return (lambda i: estimator.detect(frames[i % len(frames)])), estimator.close
+    return Benchmark(f"pose_detect_{imgsz}", setup, iterations=30, warmup=3)
+
+
+def process_frame_case():
+    def setup():
+        from ui.camera_manager import CameraManager
+        manager = CameraManager(pygame.display.get_surface())
+        frames = synthetic_frames()
+        return (lambda i: manager.process_frame(frames[i % len(frames)])), manager.close
+    return Benchmark("camera_process_frame", setup, iterations=30, warmup=3)
+
+
+def frame_to_surface_case():
+    def setup():
+        from ui.camera_manager import CameraManager
+        manager = CameraManager(pygame.display.get_surface())
+        frames = synthetic_frames()
+        return (lambda i: manager.frame_to_surface(frames[i % len(frames)])), manager.close
+    return Benchmark("camera_frame_to_surface", setup, iterations=300)
+
+
+def animal_march_case():
+    def setup():
+        from minigames.animal_march_logic import AnimalMarchGame, FRUIT_SIZE
+        game = AnimalMarchGame(pygame.display.get_surface(), [pygame.Surface(FRUIT_SIZE)])
+        poses = synthetic_poses()
+        return lambda i: game.process_keypoints(poses[i % len(poses)], timestamp(i))
+    return Benchmark("game_animal_march_update", setup, iterations=2000)
+
+
+def tree_pose_case():
+    def setup():
+        from minigames.tree_pose_logic import TreePoseLogic
+        now = [0.0]
+        logic = TreePoseLogic(clock=lambda: now[0])
+        poses = synthetic_poses()
+
+        def step(i):
+            now[0] = timestamp(i)
+            logic.update(poses[i % len(poses)], now[0])
+        return step
+    return Benchmark("game_tree_pose_update", setup, iterations=2000)
+
+
+def river_crossing_case():
+    def setup():
+        from minigames.river_crossing_logic import RiverCrossingGame
+        game = RiverCrossingGame()
+        game.set_screen_dimensions(*SCREEN_SIZE)
+        poses = synthetic_poses()
+        return lambda i: game.update(poses[i % len(poses)], timestamp(i))
+    return Benchmark("game_river_crossing_update", setup, iterations=2000)
+
+
+def tree_growth_case():
+    def setup():
+        from ui.tree_growth_manager import TreeGrowthManager
+        screen = pygame.display.get_surface()
+        manager = TreeGrowthManager(SCREEN_SIZE)
+        manager.start_new_tree()
+        manager.prefetch.join()  # time the steady state, not the background pre-scaling
+
+        def step(i):
+            manager.progress = (i % 64) / 63  # every draw at a new growth stage
+            manager.draw(screen)
+        return step
+    return Benchmark("tree_growth_draw", setup, iterations=300)
+
+
+def desc_font_case():
+    def setup():
+        from ui.desc_font import DescFont
+        font = DescFont(pygame.display.get_surface(), size=24, margin=50)
+        text = ("In this stage, children practice coordination, balance, and gross motor skills "
+                "through fun jungle-themed games. Each exercise is wrapped in a story to keep them engaged.")
+        return lambda i: font.render_text(text, 400)
+    return Benchmark("desc_font_render_text", setup, iterations=300)
+
+
+def camera_screen_case(name, module, class_name):
+    """
+    Full draw() of a camera screen. Frames and keypoints are fed straight into
+    the pipeline's handoff slots, so no camera or inference thread is involved
+    (inference is measured by the pose_detect cases).
+    """
+    def setup():
+        import importlib
+        screen_class = getattr(importlib.import_module(module), class_name)
+        screen = screen_class(pygame.display.get_surface())
+        screen.camera_on = True
+        pipeline = screen.pipeline
+        frames = synthetic_frames()
+        poses = synthetic_poses()
+        track_ids = np.array([1], dtype=np.int32)
+
+        def step(i):
+            pipeline.predictor.update(timestamp(i), poses[i % len(poses)], track_ids)
+            pipeline.display_slot.put((frames[i % len(frames)], timestamp(i)))
+            screen.draw()
+        return step, screen.close
+    return Benchmark(f"screen_draw_{name}", setup, iterations=150)
+
+
+def all_benchmarks():
+    return [detect_case(size) for size in DETECT_SIZES] + [
+        process_frame_case(),
+        frame_to_surface_case(),
+        animal_march_case(),
+        tree_pose_case(),
+        river_crossing_case(),
+        tree_growth_case(),
+        desc_font_case(),
+        camera_screen_case("animal_march", "screens.jungle_stages.animal_march.animal_march_camera", "AnimalMarchCamera"),
+        camera_screen_case("tree_pose", "screens.jungle_stages.tree_pose.tree_pose_camera", "TreePoseCamera"),
+        camera_screen_case("river_crossing", "screens.jungle_stages.river_crossing.river_crossing_camera", "RiverCrossingCamera"),
+    ]
+
+
+# -------------------- Runner --------------------
+def run(benchmarks, scale=1.0):
+    results = {}
+    for benchmark in benchmarks:
+        try:
+            results[benchmark.name] = measure(benchmark, scale)
+        except Exception as e:
+            # e.g. no model weights on this machine: report and keep going
+            results[benchmark.name] = {"error": f"{type(e).__name__}: {e}"}
+        print(format_result(benchmark.name, results[benchmark.name]), flush=True)
+    return results
+
+
+def format_result(name, result):
+    if "error" in result:
+        return f"{name:34s} skipped ({result['error']})"
+    return (f"{name:34s} p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  "
+            f"p99 {result['p99_ms']:8.3f} ms  {result['throughput']:10.1f} /s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MoveQuest hot-path benchmarks")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="run 20%% of the iterations")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown of p50/p95 that counts as a regression")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+
+    benchmarks = [b for b in all_benchmarks() if not args.pattern or args.pattern in b.name]
+    results = run(benchmarks, scale=0.2 if args.quick else 1.0)
+
+    from pose_estimator import shutdown_pose_estimator
+    shutdown_pose_estimator()
+    pygame.quit()
+
+    if args.output:
+        save_baseline(args.output, results)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, {name: r for name, r in results.items() if "error" not in r})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to create one")
+        return 0
+
+    regressions = 0
+    print(f"\nCompared with {args.baseline}:")
+    for name, (ratio_p50, ratio_p95, regressed) in compare(results, load_baseline(args.baseline), args.threshold).items():
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:34s} p50 x{ratio_p50:5.2f}  p95 x{ratio_p95:5.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
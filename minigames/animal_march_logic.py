@@ -1,12 +1,15 @@
+import time
 import numpy as np
 import random
-import pygame
-from collections import deque
-from assets.fonts import dynapuff
+from assets.fonts import default_font, dynapuff
+from pose_estimator import LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE
+from ui.text_cache import render_text
 
 FRUIT_SIZE = (100, 100)
 FRUIT_FOLDER = "assets/fruits/"
 MAX_SCORE = 20
+MARCH_JOINTS = [LEFT_KNEE, RIGHT_KNEE, LEFT_HIP, RIGHT_HIP]
+MARCH_COOLDOWN_MS = 500
 
 class FallingFruit:
     def __init__(self, image, x, y=0, speed=None):
@@ -22,9 +25,14 @@ class FallingFruit:
         screen.blit(self.image, (self.x, self.y))
 
 class AnimalMarchGame:
-    def __init__(self, screen, fruit_images):
+    def __init__(self, screen, fruit_images, play_area=None):
+        """
+        play_area: pygame.Rect this player's fruits fall in (whole screen by
+            default; one half of it in split-screen two-player mode)
+        """
         self.screen = screen
         self.fruit_images = fruit_images
+        self.play_area = play_area or screen.get_rect()
 
         # Score & game state
         self.score = 0
@@ -34,27 +42,34 @@ class AnimalMarchGame:
         self.knee_was_up = False
         self.initialized = False
 
-        # Smoothing with longer history for more stable detection
-        self.knee_history_len = 8
-        self.left_knee_history = deque(maxlen=self.knee_history_len)
-        self.right_knee_history = deque(maxlen=self.knee_history_len)
-        
         # Movement detection
-        self.march_cooldown = 0  # Prevent multiple triggers
-        self.min_cooldown_frames = 15  # Minimum frames between march detections
-        
+        self.march_cooldown = 0  # ms left before the next step counts (prevents multiple triggers)
+        self.min_cooldown_ms = MARCH_COOLDOWN_MS  # Minimum time between march detections
+        self.last_timestamp = None
+
         # Active fruits
         self.falling_fruits = []
 
         # Debug info
         self.debug_text = ""
 
-    def process_keypoints(self, keypoints):
+    def process_keypoints(self, keypoints, timestamp=None):
         """
-        keypoints: list of humans, each human is a list of 17 [x, y, conf]
+        Step the game once per new pose result.
+        keypoints: float32 array of shape (N, 17, 3) from the camera pipeline,
+        already smoothed by its PoseFilter
+        timestamp: capture time of the frame in seconds (PoseResult.timestamp)
         Only uses hips and knees; ignores missing keypoints
         """
-        if not keypoints:
+        if timestamp is None:
+            timestamp = time.time()
+        elapsed_ms = 0.0 if self.last_timestamp is None else (timestamp - self.last_timestamp) * 1000
+        self.last_timestamp = timestamp
+
+        # Reduce cooldown
+        self.march_cooldown = max(0.0, self.march_cooldown - elapsed_ms)
+
+        if keypoints is None or len(keypoints) == 0:
             self.debug_text = "No humans detected"
             return
 
@@ -65,16 +80,14 @@ class AnimalMarchGame:
         march_threshold = 30  # Increased threshold for more reliable detection
 
         # Extract knees and hips with confidence check
-        left_knee = kp[13]   # [x, y, conf]
-        right_knee = kp[14]  # [x, y, conf]
-        left_hip = kp[11]    # [x, y, conf] 
-        right_hip = kp[12]   # [x, y, conf]
+        left_knee = kp[LEFT_KNEE]    # [x, y, conf]
+        right_knee = kp[RIGHT_KNEE]  # [x, y, conf]
+        left_hip = kp[LEFT_HIP]      # [x, y, conf]
+        right_hip = kp[RIGHT_HIP]    # [x, y, conf]
 
-        # Check if keypoints are valid
-        left_knee_valid = left_knee[2] >= conf_thresh
-        right_knee_valid = right_knee[2] >= conf_thresh
-        left_hip_valid = left_hip[2] >= conf_thresh
-        right_hip_valid = right_hip[2] >= conf_thresh
+        # Check if keypoints are valid (one vectorized comparison)
+        left_knee_valid, right_knee_valid, left_hip_valid, right_hip_valid = (
+            kp[MARCH_JOINTS, 2] >= conf_thresh).tolist()
 
         self.debug_text = f"LK: {left_knee_valid} RK: {right_knee_valid} LH: {left_hip_valid} RH: {right_hip_valid}"
 
@@ -84,60 +97,47 @@ class AnimalMarchGame:
                 self.debug_text += " - Insufficient keypoints"
                 return
 
-        # Reduce cooldown
-        if self.march_cooldown > 0:
-            self.march_cooldown -= 1
-
         # Use knees if available, otherwise use hips
         if left_knee_valid and right_knee_valid:
-            left_y = left_knee[1]
-            right_y = right_knee[1]
+            left_y = float(left_knee[1])
+            right_y = float(right_knee[1])
             joint_type = "knee"
         else:
-            left_y = left_hip[1]
-            right_y = right_hip[1]
+            left_y = float(left_hip[1])
+            right_y = float(right_hip[1])
             joint_type = "hip"
 
-        # Add to history for smoothing
-        self.left_knee_history.append(left_y)
-        self.right_knee_history.append(right_y)
-
-        # Calculate smoothed positions
-        if len(self.left_knee_history) >= 3 and len(self.right_knee_history) >= 3:
-            left_avg = sum(self.left_knee_history) / len(self.left_knee_history)
-            right_avg = sum(self.right_knee_history) / len(self.right_knee_history)
-            
-            # Calculate difference
-            height_diff = abs(left_avg - right_avg)
-            
-            # Check for marching motion
-            is_marching = height_diff >= march_threshold
-            
-            self.debug_text += f" | {joint_type.upper()} diff: {height_diff:.1f}"
-
-            if not self.initialized:
-                self.knee_was_up = is_marching
-                self.initialized = True
-                return
-
-            # Detect march step (transition from not marching to marching)
-            if (is_marching and not self.knee_was_up and 
-                self.march_cooldown == 0 and self.score < self.max_score):
-                
-                self.score += 1
-                self.march_cooldown = self.min_cooldown_frames
-                self.debug_text += f" | MARCH! Score: {self.score}"
+        # Calculate difference
+        height_diff = abs(left_y - right_y)
 
-                # Spawn a fruit
-                fruit_img = random.choice(self.fruit_images)
-                x_pos = random.randint(0, self.screen.get_width() - FRUIT_SIZE[0])
-                self.falling_fruits.append(FallingFruit(fruit_img, x_pos))
+        # Check for marching motion
+        is_marching = height_diff >= march_threshold
 
-                if self.score >= self.max_score:
-                    self.game_over = True
-                    self.next_screen = "jungle_win"
+        self.debug_text += f" | {joint_type.upper()} diff: {height_diff:.1f}"
 
+        if not self.initialized:
             self.knee_was_up = is_marching
+            self.initialized = True
+            return
+
+        # Detect march step (transition from not marching to marching)
+        if (is_marching and not self.knee_was_up and
+            self.march_cooldown == 0 and self.score < self.max_score):
+
+            self.score += 1
+            self.march_cooldown = self.min_cooldown_ms
+            self.debug_text += f" | MARCH! Score: {self.score}"
+
+            # Spawn a fruit
+            fruit_img = random.choice(self.fruit_images)
+            x_pos = random.randint(self.play_area.left, self.play_area.right - FRUIT_SIZE[0])
+            self.falling_fruits.append(FallingFruit(fruit_img, x_pos))
+
+            if self.score >= self.max_score:
+                self.game_over = True
+                self.next_screen = "jungle_win"
+
+        self.knee_was_up = is_marching
 
     def update_fruits(self):
         """Move fruits down the screen"""
@@ -153,9 +153,9 @@ class AnimalMarchGame:
     def draw_debug_info(self):
         """Draw debug information on screen"""
         if self.debug_text:
-            debug_font = pygame.font.Font(None, 24)
-            debug_surface = debug_font.render(self.debug_text, True, (255, 255, 0))
-            self.screen.blit(debug_surface, (10, 100))
+            debug_font = default_font(24)
+            debug_surface = render_text(debug_font, self.debug_text, (255, 255, 0))
+            self.screen.blit(debug_surface, (self.play_area.left + 10, 100))
 
     def get_next_screen(self):
         if self.game_over and self.next_screen:
@@ -1,12 +1,17 @@
+import time
 import numpy as np
 import pygame
+from assets.fonts import default_font
 import random
-from collections import deque
+from pose_estimator import LEFT_ANKLE, RIGHT_ANKLE
+from ui.text_cache import render_text
+from assets.asset_manager import scaled_image
 
 POINT_RADIUS = 60  # Increased from 40 for easier targeting
 STONE_DETECTION_RADIUS = 80  # Even more generous detection area
 MIN_STONE_DISTANCE = 100  # Minimum distance from current foot position
 MAX_STONE_DISTANCE = 300  # Maximum distance from current foot position
+HIT_COOLDOWN_MS = 1000  # Prevent multiple hits on same stone
 
 class RiverCrossingGame:
     def __init__(self, points_to_win=5):
@@ -17,22 +22,18 @@ class RiverCrossingGame:
         self.screen_width = 1280  # Default screen width, can be updated
         self.screen_height = 720  # Default screen height, can be updated
         
-        # Foot position smoothing
-        self.foot_history_len = 5
-        self.left_foot_history = deque(maxlen=self.foot_history_len)
-        self.right_foot_history = deque(maxlen=self.foot_history_len)
-        
         # Stone hit detection
-        self.hit_cooldown = 0
-        self.min_cooldown_frames = 30  # Prevent multiple hits on same stone
+        self.hit_cooldown = 0  # ms left before another hit counts
+        self.min_cooldown_ms = HIT_COOLDOWN_MS
+        self.last_timestamp = None
         
         # Track current foot positions for stone generation
         self.current_foot_positions = []
         self.last_foot_y = None
 
         self.rock_images = [
-            pygame.transform.scale(pygame.image.load("assets/rocks/rock_1.png").convert_alpha(), (POINT_RADIUS*2, POINT_RADIUS*2)),
-            pygame.transform.scale(pygame.image.load("assets/rocks/rock_2.png").convert_alpha(), (POINT_RADIUS*2, POINT_RADIUS*2))
+            scaled_image("assets/rocks/rock_1.png", (POINT_RADIUS*2, POINT_RADIUS*2), filter="fast"),
+            scaled_image("assets/rocks/rock_2.png", (POINT_RADIUS*2, POINT_RADIUS*2), filter="fast")
         ]
 
         self.current_rock_image = None
@@ -44,44 +45,22 @@ class RiverCrossingGame:
 
     def feet_positions(self, keypoints, conf_threshold=0.5):
         """
-        keypoints: list of 17 [x,y,conf]
+        keypoints: (17, 3) array of [x, y, conf] for one human, already
+        smoothed by the camera pipeline's PoseFilter
         Returns list of detected ankles [(x,y), ...] or None if none found
         """
         if keypoints is None or len(keypoints) < 17:
             return None
 
         # Extract ankle keypoints (indices 15 and 16)
-        left_ankle = keypoints[15]   # [x, y, conf]
-        right_ankle = keypoints[16]  # [x, y, conf]
-        
-        left_x, left_y, left_conf = left_ankle
-        right_x, right_y, right_conf = right_ankle
+        left_x, left_y, left_conf = keypoints[LEFT_ANKLE].tolist()
+        right_x, right_y, right_conf = keypoints[RIGHT_ANKLE].tolist()
 
         feet = []
-        
-        # Check left ankle
         if left_conf >= conf_threshold:
-            # Add to smoothing history
-            self.left_foot_history.append((left_x, left_y))
-            if len(self.left_foot_history) >= 3:
-                # Use smoothed position
-                avg_x = sum(pos[0] for pos in self.left_foot_history) / len(self.left_foot_history)
-                avg_y = sum(pos[1] for pos in self.left_foot_history) / len(self.left_foot_history)
-                feet.append((int(avg_x), int(avg_y)))
-            else:
-                feet.append((int(left_x), int(left_y)))
-        
-        # Check right ankle  
+            feet.append((int(left_x), int(left_y)))
         if right_conf >= conf_threshold:
-            # Add to smoothing history
-            self.right_foot_history.append((right_x, right_y))
-            if len(self.right_foot_history) >= 3:
-                # Use smoothed position
-                avg_x = sum(pos[0] for pos in self.right_foot_history) / len(self.right_foot_history)
-                avg_y = sum(pos[1] for pos in self.right_foot_history) / len(self.right_foot_history)
-                feet.append((int(avg_x), int(avg_y)))
-            else:
-                feet.append((int(right_x), int(right_y)))
+            feet.append((int(right_x), int(right_y)))
 
         return feet if feet else None
 
@@ -115,13 +94,21 @@ class RiverCrossingGame:
         self.current_rock_image = random.choice(self.rock_images)
 
 
-    def update(self, keypoints_list):
-        if self.game_over or not keypoints_list:
-            return
+    def update(self, keypoints_list, timestamp=None):
+        """
+        Step the game once per new pose result.
+        timestamp: capture time of the frame in seconds (PoseResult.timestamp)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        elapsed_ms = 0.0 if self.last_timestamp is None else (timestamp - self.last_timestamp) * 1000
+        self.last_timestamp = timestamp
 
         # Reduce hit cooldown
-        if self.hit_cooldown > 0:
-            self.hit_cooldown -= 1
+        self.hit_cooldown = max(0.0, self.hit_cooldown - elapsed_ms)
+
+        if self.game_over or keypoints_list is None or len(keypoints_list) == 0:
+            return
 
         # Get current foot positions
         current_feet = []
@@ -157,7 +144,7 @@ class RiverCrossingGame:
             if distance <= STONE_DETECTION_RADIUS:
                 # Stone hit!
                 self.score += 1
-                self.hit_cooldown = self.min_cooldown_frames
+                self.hit_cooldown = self.min_cooldown_ms
                 
                 # Check if game is complete
                 if self.score >= self.points_to_win:
@@ -182,8 +169,8 @@ class RiverCrossingGame:
         surface.blit(self.current_rock_image, rock_rect)
 
         # Optional: Draw stone number
-        font = pygame.font.Font(None, 48)
-        text = font.render(str(self.score + 1), True, (255, 255, 255))
+        font = default_font(48)
+        text = render_text(font, str(self.score + 1), (255, 255, 255))
         text_rect = text.get_rect(center=(stone_x + ox, stone_y + oy))
         surface.blit(text, text_rect)
 
@@ -200,7 +187,6 @@ class RiverCrossingGame:
         self.game_over = False
         self.current_stone = None
         self.hit_cooldown = 0
-        self.left_foot_history.clear()
-        self.right_foot_history.clear()
+        self.last_timestamp = None
         self.current_foot_positions = []
         self.last_foot_y = None
\ No newline at end of file
@@ -1,14 +1,25 @@
 import time
-from collections import deque
+import numpy as np
+from pose_estimator import LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE
+
+KEYPOINT_NAMES = ['left_hip', 'right_hip', 'left_knee', 'right_knee', 'left_ankle', 'right_ankle']
+KEYPOINT_INDICES = np.array([LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE])
+STABILITY_ALPHA = 2 / (8 + 1)  # EWMA weight, roughly an 8-sample window
+STABILITY_MIN_SAMPLES = 5
+REQUIRED_CONSISTENCY_MS = 500  # consistent pose needed before the hold timer starts
 
 class TreePoseLogic:
-    def __init__(self, hold_time=10, knee_lift_threshold=50, stability_threshold=20, confidence_threshold=0.5):
+    def __init__(self, hold_time=10, knee_lift_threshold=50, stability_threshold=20, confidence_threshold=0.5,
+                 clock=time.time):
         """
         hold_time: seconds the pose must be held to win
         knee_lift_threshold: minimum y difference between knees to consider a leg lifted  
         stability_threshold: max allowed movement for supporting leg
         confidence_threshold: minimum confidence for keypoint detection
+        clock: returns the current time in seconds; replay passes one that
+            follows the recorded timestamps
         """
+        self.clock = clock
         self.hold_time = hold_time
         self.knee_lift_threshold = knee_lift_threshold
         self.stability_threshold = stability_threshold
@@ -24,10 +35,11 @@ class TreePoseLogic:
         self.last_support_knee_y = None
         self.lifted_leg = None
         
-        # Smoothing for stability detection
-        self.support_history = deque(maxlen=8)  # Keep last 8 positions
-        self.pose_consistency_frames = 0
-        self.required_consistency = 15  # Frames of consistent pose before starting timer
+        # Running (EWMA) mean and variance of the supporting knee height
+        self.reset_stability()
+        self.pose_consistency = 0  # ms of consistent pose so far
+        self.required_consistency = REQUIRED_CONSISTENCY_MS  # ms of consistent pose before starting timer
+        self.last_timestamp = None
         
         # Debug info
         self.debug_info = ""
@@ -40,37 +52,29 @@ class TreePoseLogic:
         self.game_over = False
         self.last_support_knee_y = None
         self.lifted_leg = None
-        self.support_history.clear()
-        self.pose_consistency_frames = 0
+        self.reset_stability()
+        self.pose_consistency = 0
+        self.last_timestamp = None
         self.debug_info = ""
 
+    def reset_stability(self):
+        self.support_mean = None
+        self.support_var = 0.0
+        self.support_samples = 0
+
     def extract_keypoints(self, keypoints_list):
-        """Extract relevant keypoints from the list format"""
-        if not keypoints_list or len(keypoints_list) == 0:
+        """Extract relevant keypoints from the (N, 17, 3) keypoint array"""
+        if keypoints_list is None or len(keypoints_list) == 0:
             return None
-            
-        # Use first detected human
-        kp = keypoints_list[0]
-        
-        # Extract hip, knee, and ankle positions
-        keypoint_data = {}
-        keypoint_indices = {
-            'left_hip': 11,
-            'right_hip': 12,
-            'left_knee': 13,
-            'right_knee': 14,
-            'left_ankle': 15,
-            'right_ankle': 16
-        }
-        
-        for name, idx in keypoint_indices.items():
-            if idx < len(kp) and kp[idx][2] >= self.confidence_threshold:
-                keypoint_data[name] = (kp[idx][0], kp[idx][1])
-            else:
-                # Missing or low confidence keypoint
-                return None
-                
-        return keypoint_data
+
+        # Use first detected human; gather hips, knees and ankles in one indexing op
+        points = keypoints_list[0][KEYPOINT_INDICES]
+
+        # Missing or low confidence keypoint
+        if (points[:, 2] < self.confidence_threshold).any():
+            return None
+
+        return dict(zip(KEYPOINT_NAMES, points[:, :2].tolist()))
 
     def detect_tree_pose(self, keypoints):
         """
@@ -107,35 +111,42 @@ class TreePoseLogic:
         return False, None, None
 
     def check_stability(self, current_support_y):
-        """Check if the supporting leg is stable"""
-        self.support_history.append(current_support_y)
-        
-        if len(self.support_history) < 5:
+        """Check if the supporting leg is stable (O(1) running standard deviation)"""
+        if self.support_mean is None:
+            self.support_mean = current_support_y
+        else:
+            delta = current_support_y - self.support_mean
+            self.support_mean += STABILITY_ALPHA * delta
+            self.support_var = (1 - STABILITY_ALPHA) * (self.support_var + STABILITY_ALPHA * delta * delta)
+        self.support_samples += 1
+
+        if self.support_samples < STABILITY_MIN_SAMPLES:
             return False
-            
-        # Calculate variance in support leg position
-        positions = list(self.support_history)
-        avg_pos = sum(positions) / len(positions)
-        variance = sum((pos - avg_pos) ** 2 for pos in positions) / len(positions)
-        stability = variance ** 0.5  # Standard deviation
-        
+
+        stability = self.support_var ** 0.5  # Standard deviation
         return stability <= self.stability_threshold
 
-    def update(self, keypoints_list):
+    def update(self, keypoints_list, timestamp=None):
         """
-        Update game state with new keypoints
+        Update game state with a new pose result (call once per result)
+        timestamp: capture time of the frame in seconds (PoseResult.timestamp)
         Returns: seconds left if countdown active, None otherwise
         """
+        if timestamp is None:
+            timestamp = self.clock()
+        elapsed_ms = 0.0 if self.last_timestamp is None else (timestamp - self.last_timestamp) * 1000
+        self.last_timestamp = timestamp
+
         # Extract keypoints from list format
         keypoints = self.extract_keypoints(keypoints_list)
         
         if not keypoints:
             # Reset pose detection if no valid keypoints
-            self.pose_consistency_frames = 0
+            self.pose_consistency = 0
             self.in_pose_start = None
             self.timer_start = None
             self.pose_achieved = False
-            self.support_history.clear()
+            self.reset_stability()
             self.debug_info = "No valid keypoints detected"
             return None
 
@@ -148,23 +159,23 @@ class TreePoseLogic:
             
             if is_stable and lifted_leg == self.lifted_leg:
                 # Consistent pose detected
-                self.pose_consistency_frames += 1
-                self.debug_info = f"Consistent pose: {lifted_leg} leg lifted, frames: {self.pose_consistency_frames}"
+                self.pose_consistency += elapsed_ms
+                self.debug_info = f"Consistent pose: {lifted_leg} leg lifted, {self.pose_consistency:.0f} ms"
                 
-                if self.pose_consistency_frames >= self.required_consistency:
+                if self.pose_consistency >= self.required_consistency:
                     if not self.timer_start:
                         # Start the countdown timer
-                        self.timer_start = time.time()
+                        self.timer_start = timestamp
                         self.pose_achieved = True
                         self.debug_info = f"Timer started! {lifted_leg} leg lifted"
             else:
                 # Pose changed or became unstable
                 if lifted_leg != self.lifted_leg:
-                    self.pose_consistency_frames = 1  # Reset but don't zero (new pose detected)
+                    self.pose_consistency = elapsed_ms  # Reset but don't zero (new pose detected)
                     self.lifted_leg = lifted_leg
-                    self.support_history.clear()
+                    self.reset_stability()
                 else:
-                    self.pose_consistency_frames = max(0, self.pose_consistency_frames - 2)  # Decay
+                    self.pose_consistency = max(0, self.pose_consistency - 2 * elapsed_ms)  # Decay
                 
                 self.debug_info = f"Pose unstable or changed: {lifted_leg} leg, stability: {is_stable}"
             
@@ -172,15 +183,15 @@ class TreePoseLogic:
             
         else:
             # Not in tree pose
-            self.pose_consistency_frames = max(0, self.pose_consistency_frames - 3)  # Quick decay
+            self.pose_consistency = max(0, self.pose_consistency - 3 * elapsed_ms)  # Quick decay
             self.timer_start = None
             self.pose_achieved = False
-            self.support_history.clear()
+            self.reset_stability()
             self.debug_info = "Not in tree pose"
 
         # Handle countdown
         if self.timer_start and self.pose_achieved:
-            elapsed = time.time() - self.timer_start
+            elapsed = timestamp - self.timer_start
             
             if not is_in_pose or not self.check_stability(support_knee_y):
                 # Pose broken, reset timer but keep some progress
@@ -203,7 +214,7 @@ class TreePoseLogic:
     def get_time_remaining(self):
         """Get remaining time for the current hold"""
         if self.timer_start and self.pose_achieved:
-            elapsed = time.time() - self.timer_start
+            elapsed = self.clock() - self.timer_start
             return max(0, self.hold_time - elapsed)
         return None
 
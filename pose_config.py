@@ -0,0 +1,10 @@
+import os
+
+# Pose model settings from the environment. Kept free of heavy imports so
+# modules that only need a setting (frame sources, benchmarks) do not pull
+# in ultralytics through pose_estimator.
+MODEL_PATH = "yolov8n-pose.pt"
+INFERENCE_BACKEND = os.environ.get("MOVEQUEST_POSE_BACKEND", "local")  # "local", "process", "onnx" or "openvino"
+POSE_INT8 = os.environ.get("MOVEQUEST_POSE_INT8", "0") == "1"  # INT8-quantized model with the onnx/openvino backends
+INFERENCE_SIZE = int(os.environ.get("MOVEQUEST_INFERENCE_SIZE", "320"))  # model input size, e.g. 320 or 416
+ROI_TRACKING = os.environ.get("MOVEQUEST_ROI_TRACKING", "1") == "1"  # infer on a crop around the last detection
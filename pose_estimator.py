@@ -1,50 +1,451 @@
 from ultralytics import YOLO
+import threading
+from collections import namedtuple
+import cv2
 import numpy as np
+from pose_config import MODEL_PATH, INFERENCE_BACKEND, POSE_INT8, INFERENCE_SIZE, ROI_TRACKING
+
+MODEL_STRIDE = 32
+NUM_KEYPOINTS = 17
+WARMUP_RUNS = 3            # dummy inferences after loading, so the first camera frame runs at full speed
+
+# ROI tracking
+ROI_PADDING = 0.3          # crop margin around the last box, as a fraction of its size
+ROI_MIN_CONFIDENCE = 0.5   # joint confidence that counts as reliably detected
+ROI_MIN_JOINTS = 6         # reliable joints needed to trust a person in a crop
+ROI_EDGE_MARGIN = 4        # pixels from a crop edge that count as touching it
+ROI_MAX_AREA = 0.6         # crops bigger than this fraction of the frame are not worth it
+ROI_REFRESH = 30           # full-frame search every N inferences to catch people walking in
+
+# COCO keypoint indices (see list at the bottom of this file)
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 5, 6
+LEFT_HIP, RIGHT_HIP = 11, 12
+LEFT_KNEE, RIGHT_KNEE = 13, 14
+LEFT_ANKLE, RIGHT_ANKLE = 15, 16
 
 class PoseEstimator:
-    def __init__(self, model_path="yolov8n-pose.pt"):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path=MODEL_PATH, backend=INFERENCE_BACKEND, imgsz=INFERENCE_SIZE, roi=ROI_TRACKING,
+                 int8=POSE_INT8):
+        """
+        imgsz: longest side of the image the model sees, independent of the
+            camera's capture size and the display size
+        roi: track the previous detection and infer on a padded crop around
+            it, falling back to the full frame when the crop loses the person
+        backend: "local" runs YOLO in this process; "process" runs it in a
+            separate worker process (see pose_worker.py) so inference does not
+            compete with the pygame loop for the GIL; "onnx" and "openvino"
+            run a CPU export of the model without PyTorch (see pose_runtime.py),
+            falling back to "local" when the runtime is not installed or the
+            export cannot be built or loaded
+        int8: use an INT8-quantized export (onnx/openvino only)
+        """
+        self.backend = backend
+        self.imgsz = imgsz
+        self.roi = RoiTracker() if roi else None
+        self.model = None
+        self.worker = None  # non-PyTorch backend: infer(image, imgsz) and stop()
+        if backend == "process":
+            from pose_worker import ProcessPoseBackend
+            self.worker = ProcessPoseBackend(model_path)
+        elif backend in ("onnx", "openvino"):
+            from pose_runtime import RUNTIME_BACKENDS
+            try:
+                self.worker = RUNTIME_BACKENDS[backend](model_path, imgsz, int8)
+            except Exception as e:
+                # Missing runtime or export dependency, failed export, unloadable file
+                print(f"{backend} backend unavailable ({type(e).__name__}: {e}), using PyTorch")
+                self.worker = None
+                self.backend = "local"
+        if self.worker is None:
+            self.model = YOLO(model_path)
+        # One model instance is shared by every screen, so inference calls are serialized
+        self._lock = threading.Lock()
 
-    def detect(self, frame):
+    def detect(self, frame, annotate=False):
         """
+        annotate: draw boxes and skeleton into a copy of the frame with
+            ultralytics' plotter (slow; screens use SkeletonRenderer instead).
+            Only available with the local backend.
         Returns:
-            annotated_frame: frame with skeleton plotted
-            humans_keypoints: list of humans, each is a list of 17 keypoints [x,y,conf]
+            annotated_frame: frame with skeleton plotted, or the input frame if annotate is False
+            humans_keypoints: float32 array of shape (N, 17, 3), one [x, y, conf] row per keypoint,
+                in the pixel coordinates of `frame`
+        """
+        if annotate and self.worker is None:
+            with self._lock:
+                results = self.model(frame, imgsz=self.imgsz, verbose=False)
+            return results[0].plot(), keypoints_from_result(results[0])
+
+        # Shrink to the inference size up front so the model (or the worker's
+        # shared-memory copy) never touches full-resolution pixels. ROI crops
+        # keep the same pixel density, so they run at a smaller model input.
+        h, w = frame.shape[:2]
+        scale = min(1.0, self.imgsz / max(h, w))
+
+        region = self.roi.next_region(w, h) if self.roi is not None else None
+        if region is not None:
+            x1, y1, x2, y2 = region
+            keypoints = self._infer(frame[y1:y2, x1:x2], scale)
+            keypoints[..., 0] += x1
+            keypoints[..., 1] += y1
+            if not self.roi.accept(keypoints, region, (w, h)):
+                # Lost the person or they left the crop: search the whole frame
+                region = None
+                keypoints = self._infer(frame, scale)
+        else:
+            keypoints = self._infer(frame, scale)
+
+        if self.roi is not None:
+            self.roi.update(keypoints, full_frame=region is None)
+        return frame, keypoints
+
+    def _infer(self, image, scale):
+        """Run the model on `image` shrunk by `scale`; keypoints come back in `image` pixels."""
+        h, w = image.shape[:2]
+        small = image
+        if scale < 1.0:
+            new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+            small = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+        # Model input just big enough for this image, rounded up to the model stride
+        imgsz = min(self.imgsz, -(-max(small.shape[:2]) // MODEL_STRIDE) * MODEL_STRIDE)
+        with self._lock:
+            if self.worker is not None:
+                keypoints = self.worker.infer(small, imgsz)
+            else:
+                keypoints = keypoints_from_result(self.model(small, imgsz=imgsz, verbose=False)[0])
+
+        if small is not image:
+            keypoints[..., 0] *= w / small.shape[1]
+            keypoints[..., 1] *= h / small.shape[0]
+        return keypoints
+
+    def warm_up(self, runs=WARMUP_RUNS, progress=None):
+        """
+        Run dummy inferences at the configured size so one-time setup (graph
+        building, memory allocation, starting the worker process) happens now
+        instead of on the first camera frame. progress(i, runs) is called
+        after each run.
         """
-        results = self.model(frame, verbose=False)
-        annotated_frame = results[0].plot()
+        frame = np.full((self.imgsz * 3 // 4, self.imgsz, 3), 114, dtype=np.uint8)  # 4:3 like a webcam
+        if self.backend == "process":
+            # The worker loads its own copy of the model; detect() does not wait for it
+            self.worker.wait_ready(frame.nbytes)
+        for i in range(runs):
+            self._infer(frame, 1.0)
+            if progress is not None:
+                progress(i + 1, runs)
+
+    def roi_stats(self):
+        """How often ROI mode ran on a crop vs. fell back to the full frame"""
+        return self.roi.stats() if self.roi is not None else {}
+
+    def close(self):
+        """Stop the worker process, if any"""
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+
+class RoiTracker:
+    """
+    Region-of-interest tracking for PoseEstimator. Remembers the box around
+    everyone detected last time, predicts where it moves next, and hands back
+    a padded crop to run the model on. Crop results that lose the person, or
+    where someone touches the crop border, are rejected so the estimator
+    falls back to a full-frame search. A periodic full-frame refresh picks up
+    people who walk in outside the crop.
+    """
+
+    def __init__(self):
+        self.box = None                # [x1, y1, x2, y2] in frame pixels
+        self.velocity = np.zeros(4)    # box motion per inference
+        self._frames_since_full = 0
+
+        # Statistics
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+        self.refreshes = 0
+
+    def next_region(self, frame_w, frame_h):
+        """Crop (x1, y1, x2, y2) to infer on next, or None for a full-frame search."""
+        if self.box is None:
+            return None
+        if self._frames_since_full >= ROI_REFRESH:
+            self.refreshes += 1
+            return None
+
+        box = self.box + self.velocity
+        pad = ROI_PADDING * max(box[2] - box[0], box[3] - box[1])
+        x1, y1 = int(max(0, box[0] - pad)), int(max(0, box[1] - pad))
+        x2, y2 = int(min(frame_w, box[2] + pad)), int(min(frame_h, box[3] + pad))
+
+        # Not worth cropping when the crop is most of the frame anyway
+        if x2 <= x1 or y2 <= y1 or (x2 - x1) * (y2 - y1) > ROI_MAX_AREA * frame_w * frame_h:
+            return None
+        return x1, y1, x2, y2
+
+    def accept(self, keypoints, region, frame_size):
+        """Check a crop result (already in frame pixels); False means fall back to the full frame."""
+        reliable = (keypoints[..., 2] >= ROI_MIN_CONFIDENCE).sum(axis=1) >= ROI_MIN_JOINTS
+        if not reliable.any():
+            self.fallbacks += 1
+            return False
 
-        humans_keypoints = []
+        # Someone touching a crop edge that is not also a frame edge is leaving the crop
+        x1, y1, x2, y2 = region
+        frame_w, frame_h = frame_size
+        boxes = keypoint_boxes(keypoints[reliable])
+        margin = ROI_EDGE_MARGIN
+        cut = (((boxes[:, 0] <= x1 + margin) & (x1 > 0)) |
+               ((boxes[:, 1] <= y1 + margin) & (y1 > 0)) |
+               ((boxes[:, 2] >= x2 - margin) & (x2 < frame_w)) |
+               ((boxes[:, 3] >= y2 - margin) & (y2 < frame_h)))
+        if cut.any():
+            self.fallbacks += 1
+            return False
 
-        if results[0].keypoints is None:
-            return annotated_frame, []
+        self.roi_frames += 1
+        return True
 
-        # Access the actual keypoint data properly
-        keypoints_data = results[0].keypoints.data  # This is the tensor with keypoint data
-        
-        if keypoints_data is None or len(keypoints_data) == 0:
-            return annotated_frame, []
+    def update(self, keypoints, full_frame):
+        """Remember the union box of everyone reliably detected this time."""
+        if full_frame:
+            self.full_frames += 1
+            self._frames_since_full = 0
+        else:
+            self._frames_since_full += 1
 
-        # Convert tensor to numpy for easier processing
-        keypoints_numpy = keypoints_data.cpu().numpy()
+        reliable = (keypoints[..., 2] >= ROI_MIN_CONFIDENCE).sum(axis=1) >= ROI_MIN_JOINTS
+        if not reliable.any():
+            self.box = None
+            self.velocity[:] = 0.0
+            return
 
-        # loop over detected humans
-        for human_idx in range(keypoints_numpy.shape[0]):
-            human_keypoints = keypoints_numpy[human_idx]  # Shape: (17, 3) for [x, y, conf]
-            
-            full_kp = []
-            for kp_idx in range(17):  # Ensure we have exactly 17 keypoints
-                if kp_idx < len(human_keypoints):
-                    x, y, conf = human_keypoints[kp_idx]
-                    full_kp.append([float(x), float(y), float(conf)])
-                else:
-                    full_kp.append([0.0, 0.0, 0.0])  # Fill missing keypoints with zeros
-            
-            humans_keypoints.append(full_kp)
+        boxes = keypoint_boxes(keypoints[reliable])
+        box = np.array([boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max()])
+        if self.box is not None:
+            self.velocity = box - self.box
+        self.box = box
 
-        return annotated_frame, humans_keypoints
+    def stats(self):
+        attempts = self.roi_frames + self.fallbacks
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "fallbacks": self.fallbacks,
+            "refreshes": self.refreshes,
+            "fallback_rate": self.fallbacks / attempts if attempts else 0.0,
+        }
 
 
+def keypoint_boxes(keypoints, conf_threshold=ROI_MIN_CONFIDENCE):
+    """
+    (N, 4) [x1, y1, x2, y2] box around each human's confident keypoints.
+    Humans without any confident keypoint get an all-zero box.
+    """
+    visible = keypoints[..., 2] >= conf_threshold
+    xs, ys = keypoints[..., 0], keypoints[..., 1]
+    boxes = np.stack([
+        np.where(visible, xs, np.inf).min(axis=1),
+        np.where(visible, ys, np.inf).min(axis=1),
+        np.where(visible, xs, -np.inf).max(axis=1),
+        np.where(visible, ys, -np.inf).max(axis=1),
+    ], axis=1)
+    boxes[~visible.any(axis=1)] = 0.0
+    return boxes
+
+def keypoints_from_result(result):
+    """Pull the (N, 17, 3) keypoint array out of one ultralytics result"""
+    if result.keypoints is None:
+        return empty_keypoints()
+
+    # Access the actual keypoint data properly
+    keypoints_data = result.keypoints.data  # This is the tensor with keypoint data
+
+    if keypoints_data is None or len(keypoints_data) == 0:
+        return empty_keypoints()
+
+    return to_keypoint_array(keypoints_data.cpu().numpy())
+
+def empty_keypoints(num_humans=0):
+    """Zero-filled keypoint array for `num_humans` people"""
+    return np.zeros((num_humans, NUM_KEYPOINTS, 3), dtype=np.float32)
+
+# One published pose estimate: `seq` increases by one per result, `timestamp`
+# is the capture time (time.time()) of the frame it describes, `keypoints` is
+# (N, 17, 3) and `track_ids` the (N,) track ID of each row. Treated as
+# immutable: consumers must not write into the arrays.
+PoseResult = namedtuple("PoseResult", ["seq", "timestamp", "keypoints", "track_ids"])
+
+def to_keypoint_array(keypoints_numpy):
+    """
+    Coerce raw model output into a contiguous (N, 17, 3) float32 array.
+    Missing keypoints are zero-filled and extras are dropped.
+    """
+    if keypoints_numpy.ndim == 3 and keypoints_numpy.shape[1:] == (NUM_KEYPOINTS, 3):
+        return np.ascontiguousarray(keypoints_numpy, dtype=np.float32)
+
+    keypoints = empty_keypoints(keypoints_numpy.shape[0])
+    count = min(NUM_KEYPOINTS, keypoints_numpy.shape[1])
+    channels = min(3, keypoints_numpy.shape[2])
+    keypoints[:, :count, :channels] = keypoints_numpy[:, :count, :channels]
+    return keypoints
+
+
+# -------------------- Shared engine --------------------
+# Every camera screen and helper shares one loaded model. Callers acquire a
+# reference when they need the estimator and release it when they are done;
+# the model is dropped once the last reference goes away or on shutdown.
+#
+# Loading and warm-up run on a background thread (preload_pose_estimator() at
+# startup, or the first acquire), so screens stay responsive meanwhile and can
+# show pose_estimator_status() instead of freezing. The preload holds its own
+# reference until shutdown, so the warmed model survives screens coming and going.
+_engine = None
+_engine_refs = 0
+_engine_lock = threading.Lock()
+_load_done = threading.Event()   # set when the current load finished, failed or was dropped
+_loader = None          # background loading thread, while one is running
+_load_progress = 0.0    # 0..1, for loading screens
+_load_error = None      # why the last load failed, until a retry
+_load_generation = 0    # bumped on shutdown so a late loader drops its model
+_preloaded = False      # preload_pose_estimator() holds a reference
+
+def _load_engine(generation):
+    global _engine, _loader, _load_progress, _load_error
+
+    def warm_up_progress(done, runs):
+        global _load_progress
+        _load_progress = 0.5 + 0.5 * done / runs
+
+    estimator = None
+    try:
+        estimator = PoseEstimator()
+        _load_progress = 0.5
+        estimator.warm_up(progress=warm_up_progress)
+    except Exception as e:
+        print(f"Failed to load pose model: {e}")
+        if estimator is not None:
+            estimator.close()
+        estimator = None
+        _load_error = e
+
+    with _engine_lock:
+        _loader = None
+        if generation != _load_generation or _engine_refs == 0:
+            # Shut down, or everyone released it while it loaded
+            if estimator is not None:
+                estimator.close()
+            estimator = None
+            _load_progress = 0.0
+        _engine = estimator
+        _load_done.set()  # wake waiters on failure too; they get None
+
+def _start_loading():
+    """Start the background load unless the model is loaded or loading. Call with _engine_lock held."""
+    global _loader, _load_progress, _load_error
+    if _engine is not None or _loader is not None:
+        return
+    _load_done.clear()
+    _load_progress = 0.0
+    _load_error = None
+    _loader = threading.Thread(target=_load_engine, args=(_load_generation,), daemon=True)
+    _loader.start()
+
+def preload_pose_estimator():
+    """
+    Load and warm up the shared model in the background (call at startup).
+    Holds a reference until shutdown_pose_estimator(), so the model stays
+    loaded between camera screens.
+    """
+    global _engine_refs, _preloaded
+    with _engine_lock:
+        if not _preloaded:
+            _preloaded = True
+            _engine_refs += 1
+        _start_loading()
+
+def pose_estimator_status():
+    """
+    (ready, progress 0..1, error) of the shared model, for loading messages.
+    error is a short message once loading failed (see retry_pose_estimator()),
+    None otherwise.
+    """
+    with _engine_lock:
+        if _engine is not None:
+            return True, 1.0, None
+        if _load_error is not None and _loader is None:
+            message = (str(_load_error).splitlines() or [""])[0][:80]
+            return False, 0.0, f"{type(_load_error).__name__}: {message}"
+        return False, _load_progress, None
+
+def retry_pose_estimator():
+    """Load the model again after a failure (for a retry button); True if a load started."""
+    with _engine_lock:
+        if _load_error is None or _loader is not None or _engine_refs == 0:
+            return False
+        _start_loading()
+        return True
+
+def get_pose_estimator(timeout=None):
+    """
+    The loaded shared model, waiting up to `timeout` seconds for the load to
+    finish. None if it is not ready yet, failed to load (see
+    pose_estimator_status()) or was shut down meanwhile.
+    """
+    if not _load_done.wait(timeout):
+        return None
+    with _engine_lock:
+        return _engine
+
+def acquire_pose_estimator(wait=True):
+    """
+    Take a reference to the process-wide PoseEstimator, loading it on first
+    use. With wait=False the reference is taken right away and the estimator
+    is returned only if it is already loaded (None otherwise); use
+    get_pose_estimator() once it is needed. With wait=True it blocks until
+    the load finishes and returns None if loading failed.
+    """
+    global _engine_refs
+    with _engine_lock:
+        _engine_refs += 1
+        _start_loading()
+        if _engine is not None or not wait:
+            return _engine
+    return get_pose_estimator()
+
+def release_pose_estimator():
+    """Drop one reference; the model is unloaded when nobody holds it."""
+    global _engine, _engine_refs, _load_progress, _load_error
+    with _engine_lock:
+        if _engine_refs == 0:
+            return
+        _engine_refs -= 1
+        if _engine_refs == 0:
+            if _engine is not None:
+                _engine.close()
+            _engine = None
+            _load_done.clear()
+            _load_progress = 0.0
+            _load_error = None
+
+def shutdown_pose_estimator():
+    """Unload the shared model regardless of outstanding references (app exit)."""
+    global _engine, _engine_refs, _load_generation, _load_progress, _load_error, _preloaded
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+        _engine = None
+        _engine_refs = 0
+        _preloaded = False
+        _load_progress = 0.0
+        _load_error = None
+        _load_generation += 1  # a load still in flight closes its model when it finishes
+        _load_done.clear()
+
 """
 List of keypoints:
 0: nose
@@ -65,4 +466,5 @@ List of keypoints:
 15: left_ankle
 16: right_ankle
 Keypoint format: [x, y, confidence]
-"""
\ No newline at end of file
+Keypoint arrays: float32, shape (num_humans, 17, 3)
+"""
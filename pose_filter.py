@@ -0,0 +1,103 @@
+import threading
+import numpy as np
+from pose_estimator import NUM_KEYPOINTS
+
+# One-Euro parameters per COCO joint: the face barely moves and is filtered
+# hardest, hands and feet move fastest and react quickest to speed.
+#                             nose  eyes        ears        shoulders   elbows      wrists      hips        knees       ankles
+JOINT_MIN_CUTOFF = np.array([1.0,  1.0, 1.0,  1.0, 1.0,  1.5, 1.5,  1.5, 1.5,  2.0, 2.0,  1.5, 1.5,  1.5, 1.5,  2.0, 2.0], dtype=np.float32)
+JOINT_BETA = np.array([0.002, 0.002, 0.002, 0.002, 0.002, 0.004, 0.004, 0.006, 0.006, 0.01, 0.01,
+                       0.004, 0.004, 0.006, 0.006, 0.01, 0.01], dtype=np.float32)
+D_CUTOFF = 1.0            # Hz, cutoff for the speed estimate
+CONF_THRESHOLD = 0.5      # joints below this are treated as occluded
+MAX_HOLD = 0.3            # seconds an occluded joint is held at its last good position
+
+
+class PoseFilter:
+    """
+    One-Euro filter for every joint of every tracked person, run once per
+    inference right after the tracker. Slow movement is smoothed hard (no
+    jitter while a child holds a pose), fast movement passes with little lag.
+    All people and joints are filtered together in NumPy, O(1) per frame.
+
+    A joint that drops below CONF_THRESHOLD (occluded, out of frame) is held at
+    its last filtered position with its last good confidence for MAX_HOLD
+    seconds, so a momentary dropout does not reset the games' pose checks.
+    A person missing from a frame keeps their filter state for as long as the
+    tracker keeps their track, so smoothing picks up where it left off.
+    """
+
+    def __init__(self, min_cutoff=JOINT_MIN_CUTOFF, beta=JOINT_BETA, d_cutoff=D_CUTOFF,
+                 conf_threshold=CONF_THRESHOLD, max_hold=MAX_HOLD):
+        self.min_cutoff = np.broadcast_to(np.asarray(min_cutoff, dtype=np.float32), (NUM_KEYPOINTS,))
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=np.float32), (NUM_KEYPOINTS,))
+        self.d_cutoff = d_cutoff
+        self.conf_threshold = conf_threshold
+        self.max_hold = max_hold
+        self._states = {}  # track ID -> (timestamp, position, speed, conf, last_seen)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._states.clear()
+
+    def update(self, timestamp, keypoints, track_ids, live_ids=None):
+        """
+        keypoints: (N, 17, 3) array from the tracker, track_ids: (N,) int array
+        live_ids: track IDs the tracker still holds (PoseTracker.live_ids());
+            state is kept for these and dropped for every other track.
+            Defaults to the IDs in this frame.
+        Returns a filtered copy; untracked rows (ID 0) pass through unchanged.
+        """
+        with self._lock:
+            out = keypoints.copy()
+            rows = [i for i, track_id in enumerate(track_ids.tolist()) if track_id in self._states]
+            known = {int(track_ids[i]) for i in rows}
+
+            if rows:
+                states = [self._states[int(track_ids[i])] for i in rows]
+                t_prev = np.array([s[0] for s in states])
+                x_prev = np.stack([s[1] for s in states])
+                dx_prev = np.stack([s[2] for s in states])
+                good_conf = np.stack([s[3] for s in states])
+                last_seen = np.stack([s[4] for s in states])
+
+                x = keypoints[rows, :, :2]
+                conf = keypoints[rows, :, 2]
+                dt = np.maximum(timestamp - t_prev, 1e-3)[:, None, None]
+
+                # Filtered speed drives the cutoff: the faster a joint moves, the less it is smoothed
+                a_d = 1.0 / (1.0 + 1.0 / (2 * np.pi * self.d_cutoff * dt))
+                dx_hat = dx_prev + a_d * ((x - x_prev) / dt - dx_prev)
+                cutoff = self.min_cutoff[:, None] + self.beta[:, None] * np.linalg.norm(dx_hat, axis=2, keepdims=True)
+                a = 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * dt))
+                x_hat = x_prev + a * (x - x_prev)
+
+                confident = conf >= self.conf_threshold
+                held = ~confident & (timestamp - last_seen < self.max_hold)
+                position = np.where(confident[..., None], x_hat, np.where(held[..., None], x_prev, x))
+                speed = np.where(confident[..., None], dx_hat, 0.0)
+                good_conf = np.where(confident, conf, good_conf)
+                last_seen = np.where(confident, timestamp, last_seen)
+
+                out[rows, :, :2] = position
+                out[rows, :, 2] = np.where(held, good_conf, conf)
+                for j, i in enumerate(rows):
+                    self._states[int(track_ids[i])] = (timestamp, position[j], speed[j], good_conf[j], last_seen[j])
+
+            # New tracks start from their raw keypoints; retired tracks are forgotten
+            for i, track_id in enumerate(track_ids.tolist()):
+                if track_id and track_id not in known:
+                    conf = keypoints[i, :, 2]
+                    self._states[track_id] = (
+                        timestamp,
+                        keypoints[i, :, :2].copy(),
+                        np.zeros((NUM_KEYPOINTS, 2), dtype=np.float32),
+                        conf.copy(),
+                        np.where(conf >= self.conf_threshold, timestamp, -np.inf),
+                    )
+            live = set(track_ids.tolist()) if live_ids is None else set(live_ids)
+            for track_id in list(self._states):
+                if track_id not in live:
+                    del self._states[track_id]
+            return out
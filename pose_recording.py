@@ -0,0 +1,142 @@
+import os
+import struct
+import time
+import numpy as np
+from pose_estimator import NUM_KEYPOINTS, PoseResult
+
+RECORD_DIR = os.environ.get("MOVEQUEST_RECORD_DIR")  # set to record every camera session here
+
+# File layout (little endian):
+#   header  MAGIC, version, screen width, screen height, camera frame width,
+#           camera frame height, mirrored (the FrameTransform the session was shown with)
+#   records seq, timestamp, N, then N*17*3 float32 keypoints and N int32 track IDs
+#   index   (offset, timestamp) of every record
+#   footer  index offset, record count, INDEX_MAGIC
+# Keypoints are in camera-frame pixels. A file without a footer (app crashed
+# mid-session) is still readable: the reader rebuilds the index by scanning
+# the records. Version 1 files have no frame fields and keypoints in screen pixels.
+MAGIC = b"MQPOSE"
+VERSION = 2
+HEADER_V1 = struct.Struct("<6sHII")
+HEADER = struct.Struct("<6sHIIII?")
+RECORD = struct.Struct("<IdI")
+INDEX_ENTRY = struct.Struct("<Qd")
+FOOTER = struct.Struct("<QQ8s")
+INDEX_MAGIC = b"MQINDEX\0"
+KEYPOINT_BYTES = NUM_KEYPOINTS * 3 * 4
+
+
+class PoseRecorder:
+    """Appends a session's PoseResult stream to a compact, seekable binary file."""
+
+    def __init__(self, path, transform):
+        """transform: the session's FrameTransform (camera frame -> screen)"""
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, *transform.screen_size, *transform.frame_size, transform.mirror))
+        self._index = []
+
+    def write(self, result):
+        keypoints = np.ascontiguousarray(result.keypoints, dtype=np.float32)
+        track_ids = np.ascontiguousarray(result.track_ids, dtype=np.int32)
+        self._index.append((self._file.tell(), result.timestamp))
+        self._file.write(RECORD.pack(result.seq, result.timestamp, len(keypoints)))
+        self._file.write(keypoints.tobytes())
+        self._file.write(track_ids.tobytes())
+
+    def close(self):
+        if self._file is None:
+            return
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, len(self._index), INDEX_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+def session_recorder(transform, name="session"):
+    """A PoseRecorder in RECORD_DIR when recording is enabled, else None"""
+    if not RECORD_DIR:
+        return None
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    path = os.path.join(RECORD_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.mqpose")
+    return PoseRecorder(path, transform)
+
+
+class PoseRecording:
+    """
+    Random-access reader for a file written by PoseRecorder. Records are
+    returned as PoseResult; len(), indexing and iteration are supported and
+    seek_time() finds the first record at or after a timestamp.
+
+    frame_size and mirror describe how the camera frame was shown on a
+    screen_size window; frame_size is None for version 1 files, whose
+    keypoints are already in screen pixels.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        magic, version, width, height = HEADER_V1.unpack(self._file.read(HEADER_V1.size))
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path} is not a MoveQuest pose recording")
+        self.screen_size = (width, height)
+        self.frame_size = None
+        self.mirror = False
+        self._header_size = HEADER_V1.size
+        if version == VERSION:
+            self._file.seek(0)
+            _, _, _, _, frame_w, frame_h, self.mirror = HEADER.unpack(self._file.read(HEADER.size))
+            self.frame_size = (frame_w, frame_h)
+            self._header_size = HEADER.size
+        self.offsets, self.timestamps = self._read_index()
+
+    def _read_index(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size >= self._header_size + FOOTER.size:
+            self._file.seek(size - FOOTER.size)
+            index_offset, count, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+            if magic == INDEX_MAGIC:
+                self._file.seek(index_offset)
+                index = np.frombuffer(self._file.read(count * INDEX_ENTRY.size),
+                                      dtype=[("offset", "<u8"), ("timestamp", "<f8")])
+                return index["offset"], index["timestamp"]
+
+        # No footer: scan the records
+        offsets, timestamps = [], []
+        offset = self._header_size
+        while offset + RECORD.size <= size:
+            self._file.seek(offset)
+            _, timestamp, n = RECORD.unpack(self._file.read(RECORD.size))
+            end = offset + RECORD.size + n * (KEYPOINT_BYTES + 4)
+            if end > size:
+                break  # truncated last record
+            offsets.append(offset)
+            timestamps.append(timestamp)
+            offset = end
+        return np.array(offsets, dtype=np.uint64), np.array(timestamps, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        self._file.seek(int(self.offsets[i]))
+        seq, timestamp, n = RECORD.unpack(self._file.read(RECORD.size))
+        keypoints = np.frombuffer(self._file.read(n * KEYPOINT_BYTES), dtype=np.float32)
+        track_ids = np.frombuffer(self._file.read(n * 4), dtype=np.int32)
+        return PoseResult(seq, timestamp, keypoints.reshape(n, NUM_KEYPOINTS, 3), track_ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def seek_time(self, timestamp):
+        """Index of the first record captured at or after `timestamp`"""
+        return int(np.searchsorted(self.timestamps, timestamp))
+
+    def duration(self):
+        return float(self.timestamps[-1] - self.timestamps[0]) if len(self) else 0.0
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,201 @@
+import importlib
+import os
+import shutil
+import cv2
+import numpy as np
+from pose_estimator import NUM_KEYPOINTS, empty_keypoints
+
+CONF_THRESHOLD = 0.25    # person score to keep a detection (ultralytics' default)
+IOU_THRESHOLD = 0.7      # NMS overlap (ultralytics' default)
+PAD_VALUE = 114          # letterbox border, as in training
+
+
+def exported_path(model_path, fmt, imgsz, int8=False):
+    """Where the exported copy of `model_path` lives, e.g. yolov8n-pose-320-int8.onnx"""
+    stem = os.path.splitext(model_path)[0] + f"-{imgsz}" + ("-int8" if int8 else "")
+    if fmt == "onnx":
+        return stem + ".onnx"
+    return stem + "_openvino_model"
+
+
+def remove_export(path):
+    """Delete an exported model (a .onnx file or an OpenVINO directory), if present"""
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def export_model(model_path, fmt, imgsz, int8=False):
+    """
+    Export the PyTorch checkpoint once for a fixed input size and return the
+    exported path; later runs reuse the file. ONNX INT8 is produced from the
+    FP32 export with ONNX Runtime's dynamic quantization; OpenVINO INT8 is
+    calibrated by ultralytics/NNCF during export. A failed or interrupted
+    export leaves nothing behind, so the next run starts clean.
+    """
+    path = exported_path(model_path, fmt, imgsz, int8)
+    if os.path.exists(path):
+        return path
+
+    try:
+        if fmt == "onnx" and int8:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(export_model(model_path, fmt, imgsz), path, weight_type=QuantType.QUInt8)
+            return path
+
+        from ultralytics import YOLO
+        print(f"Exporting {model_path} to {fmt} at {imgsz}px{' (int8)' if int8 else ''}, this happens once")
+        if fmt == "onnx":
+            exported = YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+        else:
+            exported = YOLO(model_path).export(format="openvino", imgsz=imgsz, int8=int8)
+        os.replace(exported, path)
+    except BaseException:
+        remove_export(path)
+        raise
+    return path
+
+
+def letterbox_into(image, canvas, buffer):
+    """
+    Shared preprocessing: fit a BGR uint8 image into the square `canvas`
+    (S, S, 3) uint8 with a grey border, then write it as normalized RGB NCHW
+    into `buffer` (1, 3, S, S) float32. Both arrays are reused every call.
+    Returns (scale, pad_x, pad_y) to map model coordinates back to `image`.
+    """
+    size = canvas.shape[0]
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+    canvas[...] = PAD_VALUE
+    resized = image if (new_w, new_h) == (w, h) else cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+    np.multiply(canvas[..., ::-1].transpose(2, 0, 1), 1 / 255, out=buffer[0], casting="unsafe")
+    return scale, pad_x, pad_y
+
+
+def nms(boxes, scores, iou_threshold=IOU_THRESHOLD):
+    """Indices of the boxes kept by greedy non-maximum suppression, best first"""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        inter = (np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None) *
+                 np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None))
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def decode_pose_output(output, scale, pad_x, pad_y, conf_threshold=CONF_THRESHOLD, iou_threshold=IOU_THRESHOLD):
+    """
+    Turn raw YOLOv8-pose output (1, 5 + 17 * 3, anchors) into the (N, 17, 3)
+    keypoint array in the pixels of the image given to letterbox_into().
+    Rows are [cx, cy, w, h, score, x0, y0, c0, x1, ...]; keypoint confidences
+    are already sigmoid-activated by the exported head.
+    """
+    predictions = output[0]
+    candidates = np.flatnonzero(predictions[4] >= conf_threshold)
+    if candidates.size == 0:
+        return empty_keypoints()
+
+    cx, cy, w, h, scores = predictions[:5, candidates]
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    keep = candidates[nms(boxes, scores, iou_threshold)]
+
+    keypoints = np.ascontiguousarray(predictions[5:5 + NUM_KEYPOINTS * 3, keep].T, dtype=np.float32)
+    keypoints = keypoints.reshape(-1, NUM_KEYPOINTS, 3)
+    keypoints[..., 0] = (keypoints[..., 0] - pad_x) / scale
+    keypoints[..., 1] = (keypoints[..., 1] - pad_y) / scale
+    return keypoints
+
+
+class ExportedPoseBackend:
+    """
+    Runs an exported copy of the pose model on the CPU without PyTorch. Same
+    interface as ProcessPoseBackend: infer(image, imgsz) returns (N, 17, 3)
+    keypoints in `image` pixels, stop() frees the model. The export has a
+    fixed square input, so every image is letterboxed to that size; the
+    requested imgsz is only used by the PyTorch backends.
+    """
+
+    fmt = None
+    runtime = None  # module that must be installed, checked before exporting
+
+    def __init__(self, model_path, imgsz, int8=False):
+        importlib.import_module(self.runtime)
+        self.imgsz = imgsz
+        self.int8 = int8
+        self.path = export_model(model_path, self.fmt, imgsz, int8)
+        self._canvas = np.empty((imgsz, imgsz, 3), dtype=np.uint8)
+        self._input = np.empty((1, 3, imgsz, imgsz), dtype=np.float32)
+        try:
+            self._load(self.path)
+        except Exception as e:
+            # A cached export that does not load (truncated write, older runtime): export it again once
+            print(f"Could not load {self.path} ({e}), exporting it again")
+            remove_export(self.path)
+            self.path = export_model(model_path, self.fmt, imgsz, int8)
+            self._load(self.path)
+
+    def _load(self, path):
+        raise NotImplementedError
+
+    def _run(self, tensor):
+        raise NotImplementedError
+
+    def infer(self, image, imgsz=None):
+        scale, pad_x, pad_y = letterbox_into(image, self._canvas, self._input)
+        return decode_pose_output(self._run(self._input), scale, pad_x, pad_y)
+
+    def stop(self):
+        pass
+
+
+class OnnxPoseBackend(ExportedPoseBackend):
+    """ONNX Runtime on the CPU execution provider"""
+
+    fmt = "onnx"
+    runtime = "onnxruntime"
+
+    def _load(self, path):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def _run(self, tensor):
+        return self.session.run(None, {self._input_name: tensor})[0]
+
+    def stop(self):
+        self.session = None
+
+
+class OpenVinoPoseBackend(ExportedPoseBackend):
+    """OpenVINO on the CPU, compiled for latency (one frame at a time)"""
+
+    fmt = "openvino"
+    runtime = "openvino"
+
+    def _load(self, path):
+        import openvino as ov
+        xml = next(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".xml"))
+        compiled = ov.Core().compile_model(xml, "CPU", {"PERFORMANCE_HINT": "LATENCY"})
+        self.request = compiled.create_infer_request()
+
+    def _run(self, tensor):
+        self.request.infer({0: tensor})
+        return self.request.get_output_tensor(0).data
+
+    def stop(self):
+        self.request = None
+
+
+RUNTIME_BACKENDS = {"onnx": OnnxPoseBackend, "openvino": OpenVinoPoseBackend}
@@ -0,0 +1,154 @@
+import threading
+import numpy as np
+from pose_estimator import keypoint_boxes
+
+IOU_THRESHOLD = 0.3   # minimum box overlap to continue a track
+MAX_MISSED = 15       # inferences a track survives without a match
+
+class PoseTracker:
+    """
+    Gives every detected person a track ID that stays the same from frame to
+    frame (greedy IoU matching of keypoint boxes), and locks onto the patient:
+    the largest, most central person when the session starts. update()
+    returns the keypoints reordered so locked players come first, so games
+    that read keypoints[0] keep following the patient when a parent or
+    therapist steps into view.
+
+    While a locked player's track is alive but not detected (occluded, a
+    missed frame) only the locked players that were found are returned, so
+    nobody else is promoted into their row. Once the track is retired the
+    slot is re-locked onto the person nearest the player's last box.
+    """
+
+    def __init__(self, num_players=1, iou_threshold=IOU_THRESHOLD, max_missed=MAX_MISSED):
+        self.num_players = num_players
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.player_ids = []   # locked track IDs, patient first
+        self._boxes = {}       # track ID -> last box
+        self._missed = {}      # track ID -> inferences since last match
+        self._lost_boxes = []  # (slot, last box) of retired players, for re-locking
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def reset(self, num_players=None):
+        """Forget all tracks and lock onto new player(s) on the next update."""
+        with self._lock:
+            if num_players is not None:
+                self.num_players = num_players
+            self.player_ids = []
+            self._boxes.clear()
+            self._missed.clear()
+            self._lost_boxes = []
+
+    def live_ids(self):
+        """Track IDs still alive, including ones held through a short dropout"""
+        with self._lock:
+            return set(self._boxes)
+
+    def update(self, keypoints, frame_size):
+        """
+        keypoints: (N, 17, 3) array straight from the pose estimator
+        frame_size: (width, height) of the frame the keypoints are in
+        Returns (keypoints, track_ids): keypoints reordered with locked players
+        first and an int32 array with the track ID of each row. Everyone else
+        is left out while a locked player is missing from this frame.
+        """
+        with self._lock:
+            boxes = keypoint_boxes(keypoints)
+            track_ids = self._match(boxes)
+            self._lock_players(boxes, track_ids, frame_size)
+
+            # Locked players first (in lock order), everyone else after
+            unlocked = len(self.player_ids)
+            rank = np.full(len(track_ids), unlocked, dtype=np.int32)
+            for slot, player_id in enumerate(self.player_ids):
+                rank[track_ids == player_id] = slot
+            order = np.argsort(rank, kind="stable")
+            if (rank < unlocked).sum() < unlocked:
+                order = order[rank[order] < unlocked]
+            return keypoints[order], track_ids[order]
+
+    def _match(self, boxes):
+        ids = list(self._boxes)
+        track_ids = np.zeros(len(boxes), dtype=np.int32)
+        matched = set()
+
+        if ids and len(boxes):
+            iou = box_iou(np.array([self._boxes[i] for i in ids]), boxes)
+            # Greedy: best remaining overlap first
+            while True:
+                t, d = np.unravel_index(np.argmax(iou), iou.shape)
+                if iou[t, d] < self.iou_threshold:
+                    break
+                track_ids[d] = ids[t]
+                matched.add(ids[t])
+                iou[t, :] = -1.0
+                iou[:, d] = -1.0
+
+        # Unmatched detections with any confident joint start new tracks
+        for d in np.nonzero(track_ids == 0)[0]:
+            if boxes[d, 2] > boxes[d, 0]:
+                track_ids[d] = self._next_id
+                self._next_id += 1
+
+        for d, track_id in enumerate(track_ids):
+            if track_id:
+                self._boxes[track_id] = boxes[d]
+                self._missed[track_id] = 0
+
+        # Age out tracks that were not seen
+        for track_id in ids:
+            if track_id not in matched:
+                self._missed[track_id] += 1
+                if self._missed[track_id] > self.max_missed:
+                    if track_id in self.player_ids:
+                        self._lost_boxes.append((self.player_ids.index(track_id), self._boxes[track_id]))
+                        self._lost_boxes.sort(key=lambda lost: lost[0])
+                    del self._boxes[track_id]
+                    del self._missed[track_id]
+        self.player_ids = [p for p in self.player_ids if p in self._boxes]
+        return track_ids
+
+    def _lock_players(self, boxes, track_ids, frame_size):
+        """
+        Fill free player slots: a player who was lost is replaced by the person
+        nearest their last box, other slots by the largest, most central
+        unlocked people.
+        """
+        if len(self.player_ids) >= self.num_players:
+            self._lost_boxes = []
+            return
+        candidates = [d for d in range(len(track_ids)) if track_ids[d] and track_ids[d] not in self.player_ids]
+        if not candidates:
+            return
+
+        while self._lost_boxes and candidates and len(self.player_ids) < self.num_players:
+            slot, lost = self._lost_boxes.pop(0)
+            b = boxes[candidates]
+            distance = np.hypot((b[:, 0] + b[:, 2] - lost[0] - lost[2]) / 2, (b[:, 1] + b[:, 3] - lost[1] - lost[3]) / 2)
+            self.player_ids.insert(slot, int(track_ids[candidates.pop(int(np.argmin(distance)))]))
+        if not candidates or len(self.player_ids) >= self.num_players:
+            return
+
+        frame_w, frame_h = frame_size
+        b = boxes[candidates]
+        area = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) / float(frame_w * frame_h)
+        center_x = (b[:, 0] + b[:, 2]) / 2 / frame_w
+        score = area * (1.0 - np.abs(center_x - 0.5))
+
+        for c in np.argsort(-score)[:self.num_players - len(self.player_ids)]:
+            self.player_ids.append(int(track_ids[candidates[c]]))
+
+
+def box_iou(a, b):
+    """IoU matrix between (M, 4) and (N, 4) [x1, y1, x2, y2] boxes"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
@@ -0,0 +1,172 @@
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from pose_estimator import empty_keypoints, keypoints_from_result
+
+RING_SLOTS = 3            # frames the parent can write before reusing a slot
+LOAD_TIMEOUT = 60.0       # seconds allowed for the worker to load the model
+INFER_TIMEOUT = 2.0       # seconds before an unanswered frame counts as a hang
+RESTART_BACKOFF = 1.0     # seconds to wait between restarts of a crashing worker
+
+
+def _worker_main(model_path, shm_name, slot_bytes, request_q, result_q):
+    """
+    Worker process entry point. Reads frames out of the shared-memory ring,
+    runs YOLO and sends back compact (N, 17, 3) keypoint arrays.
+    """
+    from ultralytics import YOLO
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    model = YOLO(model_path)
+    result_q.put(("ready", None))
+
+    try:
+        while True:
+            request = request_q.get()
+            if request is None:
+                break
+            seq, slot, shape, imgsz = request
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            results = model(frame, imgsz=imgsz, verbose=False)
+            result_q.put((seq, keypoints_from_result(results[0])))
+            del frame
+    finally:
+        shm.close()
+
+
+class ProcessPoseBackend:
+    """
+    Runs pose inference in a separate process. Frames are copied into a
+    preallocated shared-memory ring (no pickling of pixels) and only the small
+    keypoint array comes back through a queue. A worker that dies or stops
+    answering is restarted; until it is back (loading takes seconds), infer()
+    returns no humans right away so the inference thread and the game keep
+    running.
+    """
+
+    def __init__(self, model_path, ring_slots=RING_SLOTS):
+        self.model_path = model_path
+        self.ring_slots = ring_slots
+        self._ctx = mp.get_context("spawn")  # don't fork pygame/SDL state into the worker
+        self._process = None
+        self._shm = None
+        self._slot_bytes = 0
+        self._request_q = None
+        self._result_q = None
+        self._ready = False
+        self._seq = 0
+        self._last_restart = 0.0
+
+        # Health counters
+        self.restarts = 0
+        self.timeouts = 0
+
+    # -------------------- Lifecycle --------------------
+    def _start(self, slot_bytes):
+        self._slot_bytes = slot_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_bytes * self.ring_slots)
+        self._request_q = self._ctx.Queue()
+        self._result_q = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.model_path, self._shm.name, slot_bytes, self._request_q, self._result_q),
+            daemon=True,
+        )
+        self._process.start()
+        self._ready = False
+        self._last_restart = time.time()
+
+    def stop(self):
+        if self._process is not None:
+            if self._process.is_alive():
+                try:
+                    self._request_q.put(None)
+                except (OSError, ValueError):
+                    pass
+                self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join(timeout=1.0)
+            self._process = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        self._ready = False
+
+    def restart(self, slot_bytes=None):
+        """Replace a dead or hung worker"""
+        self.stop()
+        self.restarts += 1
+        self._start(slot_bytes or self._slot_bytes)
+
+    def _grow_ring(self, slot_bytes):
+        """Start over with slots big enough for `slot_bytes` frames (not counted as a restart)"""
+        self.stop()
+        self._start(slot_bytes)
+
+    def is_healthy(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _ensure_worker(self, frame_bytes, wait=0.0):
+        """
+        Start the worker on first use, grow the ring for bigger frames, restart
+        it if it died. Returns whether it is ready, waiting up to `wait`
+        seconds for it to finish loading the model.
+        """
+        if self._process is None:
+            self._start(frame_bytes)
+        elif frame_bytes > self._slot_bytes:
+            self._grow_ring(frame_bytes)
+        elif not self.is_healthy():
+            if time.time() - self._last_restart < RESTART_BACKOFF:
+                return False
+            print("Pose worker died, restarting")
+            self.restart()
+
+        if not self._ready:
+            try:
+                message, _ = self._result_q.get(timeout=wait) if wait > 0 else self._result_q.get_nowait()
+                self._ready = message == "ready"
+            except queue.Empty:
+                if time.time() - self._last_restart > LOAD_TIMEOUT:
+                    print("Pose worker failed to load model, restarting")
+                    self.restart()
+        return self._ready
+
+    def wait_ready(self, frame_bytes, timeout=LOAD_TIMEOUT):
+        """Start the worker for `frame_bytes` frames and block until its model is loaded (warm-up)"""
+        deadline = time.time() + timeout
+        while not self._ensure_worker(frame_bytes, wait=min(1.0, max(0.0, deadline - time.time()))):
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.05)  # dead worker inside its restart backoff
+        return True
+
+    # -------------------- Inference --------------------
+    def infer(self, frame, imgsz):
+        """Return the (N, 17, 3) keypoint array for one BGR uint8 frame at model input size `imgsz`."""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if not self._ensure_worker(frame.nbytes):
+            return empty_keypoints()
+
+        self._seq += 1
+        slot = self._seq % self.ring_slots
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self._slot_bytes)[...] = frame
+        self._request_q.put((self._seq, slot, frame.shape, imgsz))
+
+        deadline = time.time() + INFER_TIMEOUT
+        while True:
+            try:
+                seq, keypoints = self._result_q.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                # Hung or crashed mid-frame: restart so the next frame gets a fresh worker
+                self.timeouts += 1
+                print("Pose worker timed out, restarting")
+                self.restart()
+                return empty_keypoints()
+            if seq == self._seq:
+                return keypoints
+            # Late answer to a frame we already gave up on; skip it
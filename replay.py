@@ -0,0 +1,142 @@
+"""
+Headless replay of recorded keypoint sessions through the mini-game logic.
+
+Record a session by running the app with MOVEQUEST_RECORD_DIR set, then:
+
+    python replay.py recordings/animal_march-20250101-120000.mqpose
+    python replay.py session.mqpose --game tree_pose --repeat 20
+
+Every recorded PoseResult is fed to the game as fast as the CPU allows, with
+the game clock following the recorded timestamps. Prints the score events
+(so detection regressions show up) and updates per second (so throughput
+regressions show up).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from pose_recording import PoseRecording
+
+GAMES = ("animal_march", "tree_pose", "river_crossing")
+
+
+class ReplayClock:
+    """Injectable clock that reads the timestamp of the result being replayed"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _screen_mapping(recording):
+    """
+    Maps recorded (camera-frame) keypoints to the screen pixels the session
+    was shown in, for games that hit-test against things drawn on screen.
+    """
+    if recording.frame_size is None:  # version 1 recording: already in screen pixels
+        return lambda keypoints: keypoints
+    from ui.camera_manager import FrameTransform
+    return FrameTransform(recording.frame_size, recording.screen_size, recording.mirror).apply
+
+
+def _make_game(game, screen, clock, to_screen):
+    """Returns (step, progress): step(result) feeds one result, progress() is the score to watch."""
+    if game == "animal_march":
+        from minigames.animal_march_logic import AnimalMarchGame, FRUIT_SIZE
+        logic = AnimalMarchGame(screen, [pygame.Surface(FRUIT_SIZE)])
+        return (lambda result: logic.process_keypoints(result.keypoints, result.timestamp),
+                lambda: (logic.score, logic.game_over))
+    if game == "tree_pose":
+        from minigames.tree_pose_logic import TreePoseLogic
+        logic = TreePoseLogic(clock=clock)
+        return (lambda result: logic.update(result.keypoints, result.timestamp),
+                lambda: (int(logic.pose_achieved), logic.game_over))
+    if game == "river_crossing":
+        from minigames.river_crossing_logic import RiverCrossingGame
+        logic = RiverCrossingGame()
+        logic.set_screen_dimensions(*screen.get_size())
+        return (lambda result: logic.update(to_screen(result.keypoints), result.timestamp),
+                lambda: (logic.score, logic.game_over))
+    raise ValueError(f"unknown game {game!r}")
+
+
+def replay(recording, game, start=0, seed=0):
+    """
+    Feed `recording` (a PoseRecording) through one game, starting at record
+    `start`. Returns a dict with the score events, final progress and timing.
+    """
+    random.seed(seed)  # stone placement etc. is reproducible between runs
+    screen = pygame.display.get_surface()
+    clock = ReplayClock()
+    step, progress = _make_game(game, screen, clock, _screen_mapping(recording))
+
+    events = []
+    last = progress()
+    t0 = recording.timestamps[start] if len(recording) else 0.0
+    wall_start = time.perf_counter()
+    updates = 0
+    for i in range(start, len(recording)):
+        result = recording[i]
+        clock.now = result.timestamp
+        step(result)
+        updates += 1
+        current = progress()
+        if current != last:
+            events.append((result.timestamp - t0, current))
+            last = current
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "game": game,
+        "updates": updates,
+        "events": events,
+        "final": last,
+        "seconds": wall,
+        "updates_per_second": updates / wall if wall > 0 else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded pose session through a mini-game")
+    parser.add_argument("recording", help="file written by PoseRecorder (.mqpose)")
+    parser.add_argument("--game", choices=GAMES, help="defaults to the game the file name starts with")
+    parser.add_argument("--start", type=float, default=0.0, help="seconds into the recording to start at")
+    parser.add_argument("--repeat", type=int, default=1, help="replay N times for a steadier throughput figure")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    game = args.game or next((g for g in GAMES if os.path.basename(args.recording).startswith(g)), None)
+    if game is None:
+        parser.error("cannot tell the game from the file name, pass --game")
+
+    recording = PoseRecording(args.recording)
+    pygame.init()
+    pygame.display.set_mode(recording.screen_size)  # games load images with convert_alpha()
+    start = recording.seek_time(recording.timestamps[0] + args.start) if len(recording) else 0
+
+    runs = [replay(recording, game, start, args.seed) for _ in range(args.repeat)]
+    report = runs[0]
+    print(f"{game}: {len(recording)} results, {recording.duration():.1f}s recorded")
+    for offset, (score, game_over) in report["events"]:
+        print(f"  {offset:8.2f}s  score={score}{'  WIN' if game_over else ''}")
+    score, game_over = report["final"]
+    print(f"final score={score} game_over={game_over}")
+
+    total = sum(run["seconds"] for run in runs)
+    updates = sum(run["updates"] for run in runs)
+    print(f"{updates} updates in {total:.3f}s: {updates / total if total else float('inf'):.0f} updates/s")
+
+    recording.close()
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
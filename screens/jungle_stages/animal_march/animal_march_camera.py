@@ -1,49 +1,52 @@
 import pygame
-import cv2
 import numpy as np
-import threading
-import time
-import os
 from ui.camera_manager import CameraManager
+from ui.frame_pipeline import FramePipeline
 from ui.back_button import BackButton
 from ui.camera_toggle import CameraToggleButton
+from ui.model_loading import ModelLoadingIndicator
+from ui.skeleton_renderer import SkeletonRenderer
 from ui.buttons import Button   # generic button
-from assets.fonts import dynapuff
+from assets.fonts import default_font, dynapuff
 from minigames.animal_march_logic import AnimalMarchGame, FallingFruit
+from pose_estimator import empty_keypoints, keypoint_boxes
+from ui.perf_monitor import perf
+from ui.text_cache import render_text
+from assets.asset_manager import assets, scaled_image
 
 FRUIT_SIZE = (100, 100)
 FRUIT_FOLDER = "assets/fruits/"
 
 class AnimalMarchCamera:
-    def __init__(self, screen):
+    def __init__(self, screen, frame_source=None):
+        """frame_source: FrameSource to play from (default: MOVEQUEST_FRAME_SOURCE)"""
         self.screen = screen
-        self.cap = None
         self.camera_manager = CameraManager(screen)
+        self.pipeline = FramePipeline(self.camera_manager, frame_source, name="animal_march")
+        self.skeleton_renderer = SkeletonRenderer(screen)
         self.back_button = BackButton(screen, pos=(60, 60))
         self.font = dynapuff(40)
         self.camera_button = CameraToggleButton(screen, size=180)
+        self.loading_indicator = ModelLoadingIndicator(screen)
         self.camera_on = False
 
-        # Threading
+        # Latest presented camera frame and pose result
         self.frame = None
+        self.result = None
         self.keypoints = None
-        self._stop_thread = False
-        self._thread = None
+        self.last_seq = None  # seq of the last result the game stepped on
 
         # Load fruits
-        self.fruits_images = []
-        for file in os.listdir(FRUIT_FOLDER):
-            if file.endswith(".png"):
-                img = pygame.image.load(os.path.join(FRUIT_FOLDER, file)).convert_alpha()
-                img = pygame.transform.smoothscale(img, FRUIT_SIZE)
-                self.fruits_images.append(img)
-
-        # Game logic
+        self.fruits_images = [scaled_image(path, FRUIT_SIZE) for path in assets.files(FRUIT_FOLDER)]
+
+        # Game logic (one instance per player; two in split-screen mode)
         self.game_logic = AnimalMarchGame(screen, self.fruits_images)
+        self.players = [self.game_logic]
+        self.two_player = False
+        self.player_ids = []  # track ID playing in each half, left to right
 
         # Win overlay image
-        self.win_image = pygame.image.load("assets/jungle_winner.png").convert_alpha()
-        self.win_image = pygame.transform.smoothscale(self.win_image, self.screen.get_size())
+        self.win_image = scaled_image("assets/jungle_winner.png", self.screen.get_size())
 
         # Back-to-menu button (bottom center)
         screen_w, screen_h = screen.get_size()
@@ -57,102 +60,122 @@ class AnimalMarchCamera:
         # Debug flag
         self.show_debug = True
 
-        # Start camera thread
-        self.start_camera_thread()
-
     def start_camera_thread(self):
-        if self._thread and self._thread.is_alive():
-            return
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            print("Failed to open camera!")
-            return
-        self._stop_thread = False
-        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self._thread.start()
-
-    def _capture_loop(self):
-        while not self._stop_thread:
-            if self.camera_on and self.cap and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret:
-                    # returns annotated frame and list of humans
-                    try:
-                        frame_surface, _, humans_keypoints = self.camera_manager.process_frame(frame)
-                        self.frame = frame_surface
-
-                        if humans_keypoints is None:
-                            self.keypoints = []
-                        else:
-                            # Ensure each human has 17 keypoints
-                            cleaned = []
-                            for kp in humans_keypoints:
-                                if len(kp) < 17:
-                                    # Pad with zeros if not enough keypoints
-                                    kp = kp + [[0.0, 0.0, 0.0]] * (17 - len(kp))
-                                elif len(kp) > 17:
-                                    # Truncate if too many keypoints
-                                    kp = kp[:17]
-                                cleaned.append(kp)
-                            self.keypoints = cleaned
-                    except Exception as e:
-                        print(f"Error processing frame: {e}")
-                        self.frame = None
-                        self.keypoints = []
-            time.sleep(0.01)
+        self.pipeline.start()
 
     def stop_camera_thread(self):
-        """Properly stop the camera thread"""
-        self._stop_thread = True
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-        self.cap = None
+        """Stop the capture and inference threads; the shared camera is released once idle"""
+        self.pipeline.stop()
+
+    def close(self):
+        """Stop the camera and release the shared pose model (screen eviction)"""
+        self.stop_camera_thread()
+        self.camera_manager.close()
 
     def stop_camera(self):
         """Legacy method name for compatibility"""
         self.stop_camera_thread()
 
+    # -------------------- Two-player split screen --------------------
+    def set_two_player(self, enabled):
+        """
+        Split the screen between two children. Both are tracked from the same
+        inference pass, so the second player costs no extra model time.
+        """
+        self.two_player = enabled
+        w, h = self.screen.get_size()
+        if enabled:
+            halves = [pygame.Rect(0, 0, w // 2, h), pygame.Rect(w // 2, 0, w - w // 2, h)]
+            self.players = [AnimalMarchGame(self.screen, self.fruits_images, play_area=r) for r in halves]
+        else:
+            self.players = [AnimalMarchGame(self.screen, self.fruits_images)]
+        self.game_logic = self.players[0]
+        self.player_ids = []
+        self.pipeline.tracker.reset(num_players=2 if enabled else 1)
+
+    def is_game_over(self):
+        return all(player.game_over for player in self.players)
+
+    def split_keypoints(self):
+        """Per-player keypoint arrays for the left and right halves of the screen."""
+        track_ids = self.result.track_ids
+        locked = self.pipeline.tracker.player_ids
+
+        # (Re)assign halves by where each locked child is standing on screen
+        # (the preview is mirrored, so map before comparing)
+        if sorted(self.player_ids) != sorted(locked):
+            self.player_ids = []
+        if not self.player_ids and len(locked) == 2 and all((track_ids == pid).any() for pid in locked):
+            boxes = keypoint_boxes(self.pipeline.transform.apply(self.keypoints))
+            center_x = {pid: boxes[track_ids == pid][0, [0, 2]].mean() for pid in locked}
+            self.player_ids = sorted(locked, key=center_x.get)
+
+        if not self.player_ids:
+            return [empty_keypoints(), empty_keypoints()]
+        return [self.keypoints[track_ids == pid] for pid in self.player_ids]
+
     def draw(self):
         self.screen.fill((102, 204, 255))
 
         # --- Draw camera frame if active ---
-        if self.camera_on and self.frame is not None and not self.game_logic.game_over:
-            self.screen.blit(self.frame, (0, 0))
-            if self.keypoints is not None:
-                self.game_logic.process_keypoints(self.keypoints)
-        elif not self.camera_on and not self.game_logic.game_over:
+        if self.camera_on:
+            self.frame, self.result = self.pipeline.present()
+            self.keypoints = self.result.keypoints if self.result is not None else None
+        game_over = self.is_game_over()
+        if self.camera_on and self.frame is not None and not game_over:
+            self.screen.blit(self.frame, self.pipeline.offset)
+            self.skeleton_renderer.draw(self.pipeline.overlay_keypoints, self.pipeline.transform)
+            # Step the game once per new pose result, not once per rendered frame
+            if self.result is not None and self.result.seq != self.last_seq:
+                self.last_seq = self.result.seq
+                with perf.stage("game_logic"):
+                    if self.two_player:
+                        for player, keypoints in zip(self.players, self.split_keypoints()):
+                            if not player.game_over:
+                                player.process_keypoints(keypoints, self.result.timestamp)
+                    else:
+                        self.game_logic.process_keypoints(self.keypoints, self.result.timestamp)
+            self.loading_indicator.draw()
+        elif not self.camera_on and not game_over:
             pause_font = dynapuff(60)
-            pause_text = pause_font.render("Press Camera to Begin", True, (255, 255, 255))
+            pause_text = render_text(pause_font, "Press Camera to Begin", (255, 255, 255))
             pause_rect = pause_text.get_rect(center=(self.screen.get_width() // 2,
                                                      self.screen.get_height() // 2))
             self.screen.blit(pause_text, pause_rect)
 
         # --- Game elements ---
-        self.game_logic.update_fruits()
-        self.game_logic.draw_fruits()
+        for player in self.players:
+            player.update_fruits()
+            player.draw_fruits()
 
         # Score
-        score_text = self.font.render(f"Score: {self.game_logic.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (20, self.screen.get_height() - 50))
+        if self.two_player:
+            pygame.draw.line(self.screen, (255, 255, 255), (self.screen.get_width() // 2, 0),
+                             (self.screen.get_width() // 2, self.screen.get_height()), 4)
+            for i, player in enumerate(self.players):
+                score_text = render_text(self.font, f"P{i + 1}: {player.score}", (255, 255, 255))
+                self.screen.blit(score_text, (player.play_area.left + 20, self.screen.get_height() - 50))
+        else:
+            score_text = render_text(self.font, f"Score: {self.game_logic.score}", (255, 255, 255))
+            self.screen.blit(score_text, (20, self.screen.get_height() - 50))
 
         # Debug information
-        if self.show_debug and self.camera_on and not self.game_logic.game_over:
-            self.game_logic.draw_debug_info()
-            
+        if self.show_debug and self.camera_on and not game_over:
+            for player in self.players:
+                player.draw_debug_info()
+
             # Show keypoint count
-            kp_count = len(self.keypoints) if self.keypoints else 0
-            debug_font = pygame.font.Font(None, 24)
-            kp_text = debug_font.render(f"Humans detected: {kp_count}", True, (255, 255, 0))
+            kp_count = len(self.keypoints) if self.keypoints is not None else 0
+            debug_font = default_font(24)
+            kp_text = render_text(debug_font, f"Humans detected: {kp_count}", (255, 255, 0))
             self.screen.blit(kp_text, (10, 130))
 
         # Buttons
-        if not self.game_logic.game_over:
+        if not game_over:
             self.camera_button.draw()
 
         # --- Win Overlay ---
-        if self.game_logic.game_over:
+        if game_over:
             # Draw full-screen win image
             self.screen.blit(self.win_image, (0, 0))
 
@@ -162,16 +185,16 @@ class AnimalMarchCamera:
         # Always draw back button in corner
         self.back_button.draw()
 
-        pygame.display.flip()
-
     def handle_event(self, event, mouse_pos):
+        if self.camera_on and self.loading_indicator.handle_event(event, mouse_pos):
+            return None
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.back_button.is_clicked(mouse_pos):
                 self.stop_camera_thread()
                 return "animal_march_intro"
 
             # Camera toggle (start/stop)
-            if not self.game_logic.game_over and self.camera_button.is_clicked(mouse_pos):
+            if not self.is_game_over() and self.camera_button.is_clicked(mouse_pos):
                 self.camera_on = not self.camera_on
                 if self.camera_on:
                     # Only start camera thread if turned on
@@ -181,7 +204,7 @@ class AnimalMarchCamera:
                     self.stop_camera_thread()
 
             # Back to menu button after game over
-            if self.game_logic.game_over and self.menu_button.is_clicked(mouse_pos):
+            if self.is_game_over() and self.menu_button.is_clicked(mouse_pos):
                 self.stop_camera_thread()
                 return "jungle_selector"
 
@@ -189,4 +212,8 @@ class AnimalMarchCamera:
         if event.type == pygame.KEYDOWN and event.key == pygame.K_d:
             self.show_debug = not self.show_debug
 
+        # Toggle two-player split screen with 'T' key (restarts the round)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+            self.set_two_player(not self.two_player)
+
         return None
\ No newline at end of file
@@ -3,11 +3,14 @@ from ui.buttons import Button
 from ui.back_button import BackButton
 from ui.desc_font import DescFont
 from assets.fonts import dynapuff
+from ui.static_screen import StaticScreen
+from assets.asset_manager import scaled_image
 
 ICON_DIM = 500
 
-class JungleIntro:
+class JungleIntro(StaticScreen):
     def __init__(self, screen):
+        super().__init__()
         self.screen = screen
         w, h = screen.get_size()
         self.title_font = dynapuff(72, bold=True)
@@ -15,8 +18,7 @@ class JungleIntro:
         self.back_button = BackButton(screen)
 
         # Load stage icon
-        self.icon = pygame.image.load("assets/jungle_adventure_icon.png").convert_alpha()
-        self.icon = pygame.transform.scale(self.icon, (ICON_DIM, ICON_DIM))  # adjust size as needed
+        self.icon = scaled_image("assets/jungle_adventure_icon.png", (ICON_DIM, ICON_DIM), filter="fast")  # adjust size as needed
 
         button_width = int(w * 0.5)
         button_height = 80 
@@ -28,7 +30,7 @@ class JungleIntro:
             text="Select Mini-Game"
         )
 
-    def draw(self):
+    def paint(self):
         self.screen.fill((34, 139, 34))
 
         # Draw the stage icon in the middle top
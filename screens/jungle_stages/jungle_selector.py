@@ -2,9 +2,12 @@ import pygame
 from ui.buttons import Button
 from ui.back_button import BackButton
 from assets.fonts import dynapuff
+from ui.text_cache import render_text
+from ui.static_screen import StaticScreen
 
-class JungleSelector:
+class JungleSelector(StaticScreen):
     def __init__(self, screen):
+        super().__init__()
         self.screen = screen
         self.font = dynapuff(36, bold=True)
         self.small_font = dynapuff(24)
@@ -43,9 +46,9 @@ class JungleSelector:
         )
 
         
-    def draw(self):
+    def paint(self):
         self.screen.fill((60, 120, 60))
-        title = self.font.render("Select a Mini-Game", True, (255, 255, 255))
+        title = render_text(self.font, "Select a Mini-Game", (255, 255, 255))
         self.screen.blit(title, title.get_rect(center=(self.screen.get_width()//2, 60)))
         
         # draw buttons
@@ -1,30 +1,37 @@
 import pygame
-import cv2
-import threading
-import time
 from ui.camera_manager import CameraManager
+from ui.frame_pipeline import FramePipeline
 from ui.back_button import BackButton
 from ui.camera_toggle import CameraToggleButton
+from ui.model_loading import ModelLoadingIndicator
+from ui.skeleton_renderer import SkeletonRenderer
 from ui.buttons import Button
-from assets.fonts import dynapuff
+from assets.fonts import default_font, dynapuff
+from pose_estimator import empty_keypoints
 from minigames.river_crossing_logic import RiverCrossingGame
+from ui.perf_monitor import perf
+from ui.text_cache import render_text
+from assets.asset_manager import scaled_image
 
 class RiverCrossingCamera:
-    def __init__(self, screen):
+    def __init__(self, screen, frame_source=None):
+        """frame_source: FrameSource to play from (default: MOVEQUEST_FRAME_SOURCE)"""
         self.screen = screen
-        self.cap = None
         self.camera_manager = CameraManager(screen)
+        self.pipeline = FramePipeline(self.camera_manager, frame_source, name="river_crossing")
+        self.skeleton_renderer = SkeletonRenderer(screen)
         self.back_button = BackButton(screen, pos=(60, 60))
         self.camera_button = CameraToggleButton(screen, size=180)
+        self.loading_indicator = ModelLoadingIndicator(screen)
         self.font = dynapuff(40)
         self.camera_on = False
 
-        # Threading
+        # Latest presented camera frame and pose result
         self.surface = None
-        self.offset = (0,0)
-        self.keypoints = None
-        self._stop_thread = False
-        self._thread = None
+        self.offset = (0,0)  # Keypoints are mapped to screen pixels below
+        self.result = None
+        self.keypoints = None  # screen pixels: stones are placed and hit on screen
+        self.last_seq = None  # seq of the last result the game stepped on
 
         # Game logic
         self.game_logic = RiverCrossingGame()
@@ -32,8 +39,7 @@ class RiverCrossingCamera:
         self.game_logic.set_screen_dimensions(screen.get_width(), screen.get_height())
 
         # Win overlay
-        self.win_image = pygame.image.load("assets/jungle_winner.png").convert_alpha()
-        self.win_image = pygame.transform.smoothscale(self.win_image, self.screen.get_size())
+        self.win_image = scaled_image("assets/jungle_winner.png", self.screen.get_size())
 
         # Back-to-menu button
         sw, sh = screen.get_size()
@@ -42,75 +48,40 @@ class RiverCrossingCamera:
         # Debug flag
         self.show_debug = True
 
-    # --- Camera Thread ---
+    # --- Camera Pipeline ---
     def start_camera_thread(self):
-        if self._thread and self._thread.is_alive():
-            return
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            print("Failed to open camera!")
-            return
-        self._stop_thread = False
-        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self._thread.start()
-
-    def _capture_loop(self):
-        while not self._stop_thread:
-            if self.camera_on and self.cap and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret:
-                    try:
-                        # Mirror the frame horizontally for natural interaction
-                        frame = cv2.flip(frame, 1)
-                        
-                        # Use process_frame method which returns frame_surface, _, humans_keypoints
-                        frame_surface, _, humans_keypoints = self.camera_manager.process_frame(frame)
-                        
-                        if frame_surface is not None:
-                            self.surface = frame_surface
-                            self.offset = (0, 0)  # Assuming full screen frame
-                            
-                            # Always store as list of humans (list of lists)
-                            if humans_keypoints is None:
-                                self.keypoints = []
-                            else:
-                                cleaned = []
-                                for kp in humans_keypoints:
-                                    # Make sure each human has exactly 17 keypoints
-                                    if len(kp) < 17:
-                                        kp = kp + [[0.0, 0.0, 0.0]] * (17 - len(kp))
-                                    elif len(kp) > 17:
-                                        kp = kp[:17]
-                                    cleaned.append(kp)
-                                self.keypoints = cleaned
-                    except Exception as e:
-                        print(f"Error processing frame: {e}")
-                        self.surface = None
-                        self.keypoints = []
-            time.sleep(0.01)
+        self.pipeline.start()
 
     def stop_camera_thread(self):
-        self._stop_thread = True
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-        self.cap = None
+        """Stop the capture and inference threads; the shared camera is released once idle"""
+        self.pipeline.stop()
+
+    def close(self):
+        """Stop the camera and release the shared pose model (screen eviction)"""
+        self.stop_camera_thread()
+        self.camera_manager.close()
 
     # --- Draw ---
     def draw(self):
         self.screen.fill((102,204,255))
 
+        if self.camera_on:
+            self.surface, self.result = self.pipeline.present()
+            self.keypoints = self.pipeline.transform.apply(self.result.keypoints) if self.result is not None else None
+
         if self.camera_on and self.surface:
-            # --- Update game logic each frame ---
-            if self.keypoints:
-                self.game_logic.update(self.keypoints)
+            # --- Update game logic once per new pose result ---
+            if self.result is not None and self.result.seq != self.last_seq:
+                self.last_seq = self.result.seq
+                with perf.stage("game_logic"):
+                    self.game_logic.update(self.keypoints, self.result.timestamp)
 
             # --- Draw camera ---
-            self.screen.blit(self.surface, self.offset)
+            self.screen.blit(self.surface, self.pipeline.offset)
+            self.skeleton_renderer.draw(self.pipeline.overlay_keypoints, self.pipeline.transform)
 
             # --- Draw keypoints (feet) ---
-            for i, kp in enumerate(self.keypoints or []):
+            for i, kp in enumerate(self.keypoints if self.keypoints is not None else empty_keypoints()):
                 feet = self.game_logic.feet_positions(kp)
                 if feet:
                     ox, oy = self.offset
@@ -120,8 +91,8 @@ class RiverCrossingCamera:
                         
                         # Draw foot coordinates for debugging
                         if self.show_debug:
-                            debug_font = pygame.font.Font(None, 20)
-                            coord_text = debug_font.render(f"({fx},{fy})", True, (255,255,255))
+                            debug_font = default_font(20)
+                            coord_text = render_text(debug_font, f"({fx},{fy})", (255,255,255))
                             self.screen.blit(coord_text, (fx+ox+20, fy+oy-10))
 
             # --- Draw current stone ---
@@ -135,19 +106,21 @@ class RiverCrossingCamera:
             if self.show_debug:
                 self.draw_debug_info()
 
+            self.loading_indicator.draw()
+
         elif not self.camera_on and not self.game_logic.game_over:
             text_font = dynapuff(60)
-            text = text_font.render("Press Camera to Begin", True, (255,255,255))
+            text = render_text(text_font, "Press Camera to Begin", (255,255,255))
             rect = text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
             self.screen.blit(text, rect)
 
         # --- Score ---
-        score_text = self.font.render(f"Score: {self.game_logic.score}", True, (255,255,255))
+        score_text = render_text(self.font, f"Score: {self.game_logic.score}", (255,255,255))
         score_rect = score_text.get_rect(bottomright=(self.screen.get_width()-20, self.screen.get_height()-20))
         self.screen.blit(score_text, score_rect)
 
         # --- Progress indicator ---
-        progress_text = self.font.render(f"Progress: {self.game_logic.score}/{self.game_logic.points_to_win}", True, (255,255,255))
+        progress_text = render_text(self.font, f"Progress: {self.game_logic.score}/{self.game_logic.points_to_win}", (255,255,255))
         progress_rect = progress_text.get_rect(bottomleft=(20, self.screen.get_height()-60))
         self.screen.blit(progress_text, progress_rect)
 
@@ -161,57 +134,57 @@ class RiverCrossingCamera:
             self.screen.blit(self.win_image, (0,0))
             self.menu_button.draw()
 
-        pygame.display.flip()
-
     def draw_debug_info(self):
         """Draw debug information"""
-        debug_font = pygame.font.Font(None, 24)
+        debug_font = default_font(24)
         y_offset = 10
         
         # Human count
-        human_count = len(self.keypoints) if self.keypoints else 0
-        debug_text = debug_font.render(f"Humans detected: {human_count}", True, (255, 255, 0))
+        human_count = len(self.keypoints) if self.keypoints is not None else 0
+        debug_text = render_text(debug_font, f"Humans detected: {human_count}", (255, 255, 0))
         self.screen.blit(debug_text, (10, y_offset))
         y_offset += 25
         
         # Show foot coordinates
-        if self.keypoints:
+        if human_count > 0:
             for i, kp in enumerate(self.keypoints):
                 feet = self.game_logic.feet_positions(kp)
                 if feet:
                     for j, (fx, fy) in enumerate(feet):
-                        coord_text = debug_font.render(f"Foot {j+1}: ({fx},{fy})", True, (255, 255, 0))
+                        coord_text = render_text(debug_font, f"Foot {j+1}: ({fx},{fy})", (255, 255, 0))
                         self.screen.blit(coord_text, (10, y_offset))
                         y_offset += 20
         
         # Current stone info
         if self.game_logic.current_stone:
             stone_x, stone_y = self.game_logic.current_stone
-            stone_text = debug_font.render(f"Current stone: ({stone_x}, {stone_y})", True, (255, 255, 0))
+            stone_text = render_text(debug_font, f"Current stone: ({stone_x}, {stone_y})", (255, 255, 0))
             self.screen.blit(stone_text, (10, y_offset))
             y_offset += 25
         else:
-            no_stone_text = debug_font.render("No stone generated yet", True, (255, 255, 0))
+            no_stone_text = render_text(debug_font, "No stone generated yet", (255, 255, 0))
             self.screen.blit(no_stone_text, (10, y_offset))
             y_offset += 25
         
         # Game status
-        status_text = debug_font.render(f"Game over: {self.game_logic.game_over}", True, (255, 255, 0))
+        status_text = render_text(debug_font, f"Game over: {self.game_logic.game_over}", (255, 255, 0))
         self.screen.blit(status_text, (10, y_offset))
         y_offset += 25
         
         # Hit cooldown
-        cooldown_text = debug_font.render(f"Hit cooldown: {self.game_logic.hit_cooldown}", True, (255, 255, 0))
+        cooldown_text = render_text(debug_font, f"Hit cooldown: {self.game_logic.hit_cooldown:.0f} ms", (255, 255, 0))
         self.screen.blit(cooldown_text, (10, y_offset))
         y_offset += 25
         
         # Current foot positions count
         foot_count = len(self.game_logic.current_foot_positions)
-        foot_count_text = debug_font.render(f"Tracked feet: {foot_count}", True, (255, 255, 0))
+        foot_count_text = render_text(debug_font, f"Tracked feet: {foot_count}", (255, 255, 0))
         self.screen.blit(foot_count_text, (10, y_offset))
 
     # --- Event Handling ---
     def handle_event(self, event, mouse_pos):
+        if self.camera_on and self.loading_indicator.handle_event(event, mouse_pos):
+            return None
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.back_button.is_clicked(mouse_pos):
                 self.stop_camera_thread()
@@ -4,14 +4,17 @@ from ui.back_button import BackButton
 from ui.desc_font import DescFont
 from assets.fonts import dynapuff
 import os
+from ui.static_screen import StaticScreen
+from assets.asset_manager import load_image
 
-class RiverCrossingIntro:
+class RiverCrossingIntro(StaticScreen):
     def __init__(self, screen):
+        super().__init__()
         self.screen = screen
         w, h = screen.get_size()
 
         # Title image
-        self.title_image = pygame.image.load(os.path.join("assets", "river_crossing.png")).convert_alpha()
+        self.title_image = load_image(os.path.join("assets", "river_crossing.png"))
         self.title_rect = self.title_image.get_rect(midtop=(w // 2, -25))
 
         # Description fonts
@@ -31,7 +34,7 @@ class RiverCrossingIntro:
         # Back button
         self.back_button = BackButton(screen, pos=(60, 60))
 
-    def draw(self):
+    def paint(self):
         self.screen.fill((102, 204, 255))  # bright, fun blue background
 
         # Draw title image 
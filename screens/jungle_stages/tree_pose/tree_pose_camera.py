@@ -1,37 +1,42 @@
 import pygame
-import cv2
-import threading
-import time
 from ui.camera_manager import CameraManager
+from ui.frame_pipeline import FramePipeline
 from ui.back_button import BackButton
 from ui.camera_toggle import CameraToggleButton
+from ui.model_loading import ModelLoadingIndicator
+from ui.skeleton_renderer import SkeletonRenderer
 from ui.buttons import Button
-from assets.fonts import dynapuff
+from assets.fonts import default_font, dynapuff
 from minigames.tree_pose_logic import TreePoseLogic
 from ui.tree_growth_manager import TreeGrowthManager
+from ui.perf_monitor import perf
+from ui.text_cache import render_text
+from assets.asset_manager import scaled_image
 
 class TreePoseCamera:
-    def __init__(self, screen):
+    def __init__(self, screen, frame_source=None):
+        """frame_source: FrameSource to play from (default: MOVEQUEST_FRAME_SOURCE)"""
         self.screen = screen
-        self.cap = None
         self.camera_manager = CameraManager(screen)
+        self.pipeline = FramePipeline(self.camera_manager, frame_source, name="tree_pose")
+        self.skeleton_renderer = SkeletonRenderer(screen)
         self.back_button = BackButton(screen, pos=(60, 60))
         self.camera_button = CameraToggleButton(screen, size=180)
+        self.loading_indicator = ModelLoadingIndicator(screen)
         self.font = dynapuff(40)
         self.camera_on = False
 
-        # Threading
+        # Latest presented camera frame and pose result
         self.frame = None
+        self.result = None
         self.keypoints = None
-        self._stop_thread = False
-        self._thread = None
+        self.last_seq = None  # seq of the last result the game stepped on
 
         # Game logic
         self.game_logic = TreePoseLogic(hold_time=10)
 
         # Win overlay image
-        self.win_image = pygame.image.load("assets/jungle_winner.png").convert_alpha()
-        self.win_image = pygame.transform.smoothscale(self.win_image, self.screen.get_size())
+        self.win_image = scaled_image("assets/jungle_winner.png", self.screen.get_size())
 
         # Back-to-menu button (bottom center)
         screen_w, screen_h = screen.get_size()
@@ -47,52 +52,18 @@ class TreePoseCamera:
         # Debug flag
         self.show_debug = True
 
-    # -------------------- Camera Thread --------------------
+    # -------------------- Camera Pipeline --------------------
     def start_camera_thread(self):
-        if self._thread and self._thread.is_alive():
-            return
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            print("Failed to open camera!")
-            return
-        self._stop_thread = False
-        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self._thread.start()
-
-    def _capture_loop(self):
-        while not self._stop_thread:
-            if self.camera_on and self.cap and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret:
-                    try:
-                        frame_surface, _, humans_keypoints = self.camera_manager.process_frame(frame)
-                        self.frame = frame_surface
-
-                        if humans_keypoints is None:
-                            self.keypoints = []
-                        else:
-                            # Ensure each human has 17 keypoints
-                            cleaned = []
-                            for kp in humans_keypoints:
-                                if len(kp) < 17:
-                                    kp = kp + [[0.0, 0.0, 0.0]] * (17 - len(kp))
-                                elif len(kp) > 17:
-                                    kp = kp[:17]
-                                cleaned.append(kp)
-                            self.keypoints = cleaned
-                    except Exception as e:
-                        print(f"Error processing frame: {e}")
-                        self.frame = None
-                        self.keypoints = []
-            time.sleep(0.01)
+        self.pipeline.start()
 
     def stop_camera_thread(self):
-        self._stop_thread = True
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-        self.cap = None
+        """Stop the capture and inference threads; the shared camera is released once idle"""
+        self.pipeline.stop()
+
+    def close(self):
+        """Stop the camera and release the shared pose model (screen eviction)"""
+        self.stop_camera_thread()
+        self.camera_manager.close()
 
     # -------------------- Draw --------------------
     def draw(self):
@@ -100,17 +71,26 @@ class TreePoseCamera:
         self.screen.fill((102, 204, 255))
 
         # Draw camera frame if active
+        if self.camera_on:
+            self.frame, self.result = self.pipeline.present()
+            self.keypoints = self.result.keypoints if self.result is not None else None
         if self.camera_on and self.frame is not None and not self.game_logic.game_over:
-            self.screen.blit(self.frame, (0, 0))
-            seconds_left = self.game_logic.update(self.keypoints)
+            self.screen.blit(self.frame, self.pipeline.offset)
+            self.skeleton_renderer.draw(self.pipeline.overlay_keypoints, self.pipeline.transform)
+            # Step the game once per new pose result, not once per rendered frame
+            if self.result is not None and self.result.seq != self.last_seq:
+                self.last_seq = self.result.seq
+                with perf.stage("game_logic"):
+                    self.game_logic.update(self.keypoints, self.result.timestamp)
+            self.loading_indicator.draw()
 
             """# Draw visual indicators for pose detection
-            if self.keypoints:
+            if self.keypoints is not None and len(self.keypoints) > 0:
                 self.draw_pose_indicators()"""
 
         elif not self.camera_on and not self.game_logic.game_over:
             pause_font = dynapuff(60)
-            pause_text = pause_font.render("Press Camera to Begin", True, (255, 255, 255))
+            pause_text = render_text(pause_font, "Press Camera to Begin", (255, 255, 255))
             pause_rect = pause_text.get_rect(center=(self.screen.get_width() // 2,
                                                      self.screen.get_height() // 2))
             self.screen.blit(pause_text, pause_rect)
@@ -118,7 +98,7 @@ class TreePoseCamera:
         # Instructions
         if not self.game_logic.game_over and not self.game_logic.pose_achieved:
             instruction_font = dynapuff(30)
-            instruction_text = instruction_font.render("Stand on one leg like a tree!", True, (255, 255, 255))
+            instruction_text = render_text(instruction_font, "Stand on one leg like a tree!", (255, 255, 255))
             instruction_rect = instruction_text.get_rect(center=(self.screen.get_width() // 2, 50))
             self.screen.blit(instruction_text, instruction_rect)
 
@@ -126,7 +106,7 @@ class TreePoseCamera:
         if self.game_logic.pose_achieved and not self.game_logic.game_over:
             seconds_left = self.game_logic.get_time_remaining()
             if seconds_left is not None and seconds_left > 0:
-                timer_text = self.font.render(f"Hold: {int(seconds_left)}s", True, (255, 0, 0))
+                timer_text = render_text(self.font, f"Hold: {int(seconds_left)}s", (255, 0, 0))
                 timer_rect = timer_text.get_rect(center=(self.screen.get_width() // 2, 100))
                 self.screen.blit(timer_text, timer_rect)
 
@@ -166,15 +146,13 @@ class TreePoseCamera:
             self.screen.blit(self.win_image, (0, 0))
             self.menu_button.draw()
 
-        pygame.display.flip()
-
     def draw_pose_indicators(self):
         """Draw visual indicators for detected body parts"""
-        if not self.keypoints:
+        if self.keypoints is None or len(self.keypoints) == 0:
             return
             
-        # Use first detected human
-        kp = self.keypoints[0]
+        # Use first detected human, in screen pixels
+        kp = self.pipeline.transform.apply(self.keypoints[:1])[0]
         
         # Draw key points for tree pose
         keypoint_colors = {
@@ -187,36 +165,38 @@ class TreePoseCamera:
         }
         
         for idx, color in keypoint_colors.items():
-            if idx < len(kp) and kp[idx][2] > 0.5:  # confidence > 0.5
+            if kp[idx, 2] > 0.5:  # confidence > 0.5
                 x, y = int(kp[idx][0]), int(kp[idx][1])
                 pygame.draw.circle(self.screen, color, (x, y), 8)
 
     def draw_debug_info(self):
         """Draw debug information"""
-        debug_font = pygame.font.Font(None, 24)
+        debug_font = default_font(24)
         y_offset = 10
         
         # Human count
-        human_count = len(self.keypoints) if self.keypoints else 0
-        debug_text = debug_font.render(f"Humans detected: {human_count}", True, (255, 255, 0))
+        human_count = len(self.keypoints) if self.keypoints is not None else 0
+        debug_text = render_text(debug_font, f"Humans detected: {human_count}", (255, 255, 0))
         self.screen.blit(debug_text, (10, y_offset))
         y_offset += 25
         
         # Game state
-        if self.keypoints:
+        if human_count > 0:
             status = "Pose Achieved" if self.game_logic.pose_achieved else "Getting Ready"
-            status_text = debug_font.render(f"Status: {status}", True, (255, 255, 0))
+            status_text = render_text(debug_font, f"Status: {status}", (255, 255, 0))
             self.screen.blit(status_text, (10, y_offset))
             y_offset += 25
             
             # Show which leg is detected as lifted (if any)
             debug_info = self.game_logic.get_debug_info()
             if debug_info:
-                debug_text = debug_font.render(debug_info, True, (255, 255, 0))
+                debug_text = render_text(debug_font, debug_info, (255, 255, 0))
                 self.screen.blit(debug_text, (10, y_offset))
 
     # -------------------- Event Handling --------------------
     def handle_event(self, event, mouse_pos):
+        if self.camera_on and self.loading_indicator.handle_event(event, mouse_pos):
+            return None
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.back_button.is_clicked(mouse_pos):
                 self.stop_camera_thread()
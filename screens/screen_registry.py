@@ -0,0 +1,116 @@
+import threading
+
+class ScreenRegistry:
+    """
+    Builds screens on demand from factories instead of all at launch.
+
+    Screens in the same group (e.g. one jungle mini-game) stay alive while the
+    user moves between them; evictable screens are closed and dropped as soon
+    as the user navigates out of their group. Each screen can name a likely
+    next screen, which is built on a background thread while the current one
+    is idle. A screen evicted while its prefetch is still building is closed
+    as soon as the build finishes.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self._factories = {}
+        self._groups = {}
+        self._evictable = set()
+        self._next = {}
+        self._screens = {}
+        self._prefetching = {}
+        self._discard = set()  # prefetches whose screen was evicted while building
+        self._lock = threading.Lock()
+
+    def register(self, name, factory, group=None, evictable=False, next_screen=None):
+        """
+        factory: callable taking the display surface and returning a screen
+        group: screens sharing a group are kept alive together
+        evictable: close and drop this screen when the user leaves its group
+        next_screen: name of the screen to prefetch while this one is idle
+        """
+        self._factories[name] = factory
+        self._groups[name] = group
+        self._next[name] = next_screen
+        if evictable:
+            self._evictable.add(name)
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def is_built(self, name):
+        return name in self._screens
+
+    def get(self, name):
+        """Return the screen, building it now if it was never built or was evicted."""
+        with self._lock:
+            thread = self._prefetching.get(name)
+        if thread is not None:
+            thread.join()
+
+        with self._lock:
+            if name not in self._screens:
+                self._screens[name] = self._factories[name](self.screen)
+            return self._screens[name]
+
+    def switch(self, from_name, to_name):
+        """Build the destination screen and evict what the user just left behind."""
+        screen = self.get(to_name)
+        from_group = self._groups.get(from_name)
+        if from_group is not None and self._groups.get(to_name) != from_group:
+            with self._lock:
+                names = set(self._screens) | set(self._prefetching)
+            for name in names:
+                if name in self._evictable and self._groups.get(name) == from_group:
+                    self.evict(name)
+        return screen
+
+    def evict(self, name):
+        """Close and drop a built screen (or one still prefetching); it will be rebuilt on next use."""
+        with self._lock:
+            screen = self._screens.pop(name, None)
+            if name in self._prefetching:
+                self._discard.add(name)
+        if screen is not None and hasattr(screen, "close"):
+            screen.close()
+
+    def prefetch(self, name):
+        """Build a screen on a background thread if it is not built yet."""
+        if name is None or name not in self._factories:
+            return
+        with self._lock:
+            if name in self._screens or name in self._prefetching:
+                return
+            thread = threading.Thread(target=self._prefetch_worker, args=(name,), daemon=True)
+            self._prefetching[name] = thread
+        thread.start()
+
+    def prefetch_next(self, name):
+        """Prefetch the screen most likely to follow `name`."""
+        self.prefetch(self._next.get(name))
+
+    def _prefetch_worker(self, name):
+        try:
+            screen = self._factories[name](self.screen)
+            with self._lock:
+                evicted = name in self._discard
+                built = screen if evicted else self._screens.setdefault(name, screen)
+            # Evicted while building, or built meanwhile by get(): drop this copy
+            if (evicted or built is not screen) and hasattr(screen, "close"):
+                screen.close()
+        except Exception as e:
+            print(f"Error prefetching screen {name}: {e}")
+        finally:
+            with self._lock:
+                self._prefetching.pop(name, None)
+                self._discard.discard(name)
+
+    def close_all(self):
+        """Close every built screen (app exit)."""
+        with self._lock:
+            threads = list(self._prefetching.values())
+        for thread in threads:
+            thread.join()
+        for name in list(self._screens):
+            self.evict(name)
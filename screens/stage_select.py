@@ -2,28 +2,30 @@ import pygame
 from ui.buttons import Button
 from ui.back_button import BackButton
 from assets.fonts import dynapuff
+from ui.text_cache import render_text
+from ui.static_screen import StaticScreen
+from assets.asset_manager import load_image, scaled_image
 
-class StageSelect:
+class StageSelect(StaticScreen):
     def __init__(self, screen):
+        super().__init__()
         self.screen = screen
         w, h = screen.get_size()
         self.back_button = BackButton(screen)
         
         # Load background
-        self.background = pygame.image.load("assets/stages_background.jpg").convert()
         # Scale and center background to fill the screen, preserving aspect ratio
-        bg_w, bg_h = self.background.get_size()
+        bg_w, bg_h = load_image("assets/stages_background.jpg", alpha=False).get_size()
         scale = max(w / bg_w, h / bg_h)
         new_bg_w, new_bg_h = int(bg_w * scale), int(bg_h * scale)
-        self.background = pygame.transform.smoothscale(self.background, (new_bg_w, new_bg_h))
+        self.background = scaled_image("assets/stages_background.jpg", (new_bg_w, new_bg_h), alpha=False)
         self.bg_offset = ((w - new_bg_w) // 2, (h - new_bg_h) // 2)
         
         # Jungle stage button
-        self.jungle_button_img = pygame.image.load("assets/select_jungle.png").convert_alpha()
         button_width = int(w * 0.75)
-        orig_w, orig_h = self.jungle_button_img.get_size()
+        orig_w, orig_h = load_image("assets/select_jungle.png").get_size()
         button_height = int(orig_h * (button_width / orig_w))
-        self.jungle_button_img = pygame.transform.smoothscale(self.jungle_button_img, (button_width, button_height))
+        self.jungle_button_img = scaled_image("assets/select_jungle.png", (button_width, button_height))
         self.button_size = (button_width, button_height)
         self.jungle_button_rect = self.jungle_button_img.get_rect(center=(w // 2, 200))
         
@@ -37,9 +39,9 @@ class StageSelect:
         # Title font
         self.font = dynapuff(60, bold=True)
 
-    def draw(self):
+    def paint(self):
         self.screen.blit(self.background, (0, 0))
-        title = self.font.render("Select a Stage", True, (255, 255, 255))
+        title = render_text(self.font, "Select a Stage", (255, 255, 255))
         self.screen.blit(title, title.get_rect(center=(self.screen.get_width() // 2, 80)))
 
         # Jungle stage button
@@ -52,7 +54,7 @@ class StageSelect:
 
         placeholder_font = dynapuff(24, italic=True)
         for rect in [self.placeholder1_rect, self.placeholder2_rect]:
-            text_surf = placeholder_font.render("Coming Soon", True, (220, 220, 220))
+            text_surf = render_text(placeholder_font, "Coming Soon", (220, 220, 220))
             self.screen.blit(text_surf, text_surf.get_rect(center=rect.center))
 
     def handle_event(self, event, mouse_pos):
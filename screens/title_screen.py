@@ -1,35 +1,69 @@
 import pygame
+from assets.fonts import dynapuff
+from pose_estimator import pose_estimator_status, retry_pose_estimator
+from ui.static_screen import StaticScreen
+from ui.text_cache import render_text
+from assets.asset_manager import load_image, scaled_image
 
-class TitleScreen:
+class TitleScreen(StaticScreen):
     def __init__(self, screen):
+        super().__init__()
         self.screen = screen
         w, h = screen.get_size()
 
         # Load background
-        self.background = pygame.image.load("assets/homepage_background.jpg").convert()
-        self.background = pygame.transform.scale(self.background, (w, h))
+        self.background = scaled_image("assets/homepage_background.jpg", (w, h), filter="fast", alpha=False)
 
         # Load logo
-        self.logo = pygame.image.load("assets/logo.png").convert_alpha()
+        logo = load_image("assets/logo.png")
         logo_w = int(w * 0.75)  # scale to ~75% of screen width
-        logo_h = int(self.logo.get_height() * (logo_w / self.logo.get_width()))
-        self.logo = pygame.transform.scale(self.logo, (logo_w, logo_h))
+        logo_h = int(logo.get_height() * (logo_w / logo.get_width()))
+        self.logo = scaled_image("assets/logo.png", (logo_w, logo_h), filter="fast")
         self.logo_rect = self.logo.get_rect(center=(w // 2, h // 2 - 100))
 
         # Load start button
-        self.start_button = pygame.image.load("assets/start_game.png").convert_alpha()
+        start_button = load_image("assets/start_game.png")
         button_w = int(w * 0.5)
-        button_h = int(self.start_button.get_height() * (button_w / self.start_button.get_width()))
-        self.start_button = pygame.transform.scale(self.start_button, (button_w, button_h))
+        button_h = int(start_button.get_height() * (button_w / start_button.get_width()))
+        self.start_button = scaled_image("assets/start_game.png", (button_w, button_h), filter="fast")
         self.start_button_rect = self.start_button.get_rect(center=(w // 2, h // 2 + 200))
 
-    def draw(self):
+        # Pose model loading status along the bottom edge, while it loads in the background
+        self.status_font = dynapuff(24)
+        self.status_rect = pygame.Rect(0, h - self.status_font.get_linesize() - 20, w, self.status_font.get_linesize())
+        self.status_text = None
+
+    def loading_status(self):
+        ready, progress, error = pose_estimator_status()
+        if error is not None:
+            return f"Couldn't load the pose model ({error}). Click here to retry."
+        return "" if ready else f"Loading pose model... {int(progress * 100)}%"
+
+    def paint(self):
         self.screen.blit(self.background, (0, 0))
         self.screen.blit(self.logo, self.logo_rect)
         self.screen.blit(self.start_button, self.start_button_rect)
+        self.paint_status(self.loading_status())
+
+    def paint_status(self, text):
+        self.status_text = text
+        if text:
+            status = render_text(self.status_font, text, (255, 255, 255))
+            self.screen.blit(status, status.get_rect(center=self.status_rect.center))
+
+    def update(self):
+        """Only the loading line changes on this screen"""
+        text = self.loading_status()
+        if text == self.status_text:
+            return []
+        self.screen.blit(self.background, self.status_rect, self.status_rect)
+        self.paint_status(text)
+        return [self.status_rect]
 
     def handle_event(self, event, mouse_pos):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.start_button_rect.collidepoint(mouse_pos):
                 return "stage_select"  # go to stage select when clicked
+            if self.status_rect.collidepoint(mouse_pos):
+                retry_pose_estimator()  # only does something after a failed load
         return None
@@ -1,5 +1,5 @@
-import pygame
 import os
+from assets.asset_manager import scaled_image
 
 IMAGE_PATH = "assets/back_button.png"
 POSITION = (60, 60)
@@ -13,8 +13,7 @@ class BackButton:
         if not os.path.isfile(image_path):
             raise FileNotFoundError(f"Back button image not found: {image_path}")
 
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, size)
+        self.image = scaled_image(image_path, size, filter="fast")
         self.rect = self.image.get_rect(center=pos)
 
     def draw(self):
@@ -1,5 +1,7 @@
 import pygame
 from assets.fonts import dynapuff
+from ui.text_cache import render_text
+from assets.asset_manager import load_image, scaled_image
 
 
 class Button:
@@ -7,9 +9,7 @@ class Button:
         self.screen = screen
         self.image = None
         if image:
-            self.image = pygame.image.load(image).convert_alpha()
-            if size:
-                self.image = pygame.transform.scale(self.image, size)
+            self.image = scaled_image(image, size, filter="fast") if size else load_image(image)
             self.rect = self.image.get_rect(center=pos)
         else:
             self.font = dynapuff(32)
@@ -22,7 +22,7 @@ class Button:
             self.screen.blit(self.image, self.rect)
         else:
             pygame.draw.rect(self.screen, (50, 150, 50), self.rect, border_radius=12)
-            text_surface = self.font.render(self.text, True, (255, 255, 255))
+            text_surface = render_text(self.font, self.text, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
             self.screen.blit(text_surface, text_rect)
 
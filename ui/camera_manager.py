@@ -1,39 +1,137 @@
+import time
 import cv2
 import numpy as np
 import pygame
-from pose_estimator import PoseEstimator
+from pose_estimator import acquire_pose_estimator, empty_keypoints, get_pose_estimator, release_pose_estimator
+from ui.perf_monitor import perf
+
+class FrameTransform:
+    """
+    Affine map from camera-frame pixels to screen pixels: mirror, scale to fit
+    and letterbox offset. The frame is drawn with exactly this mapping, so
+    keypoints passed through apply() line up with what is on screen. Game
+    logic keeps camera-frame pixels; only drawing and on-screen hit tests map.
+    """
+
+    def __init__(self, frame_size, screen_size, mirror=True):
+        self.frame_size = frame_size
+        self.screen_size = screen_size
+        self.mirror = mirror
+
+        frame_w, frame_h = frame_size
+        screen_w, screen_h = screen_size
+
+        # Keep aspect ratio
+        self.scale = min(screen_w / frame_w, screen_h / frame_h)
+        self.size = (int(frame_w * self.scale), int(frame_h * self.scale))
+
+        # Center the frame
+        self.offset = ((screen_w - self.size[0]) // 2, (screen_h - self.size[1]) // 2)
+
+        # x' = x_scale * x + x_shift, y' = scale * y + y_shift
+        if mirror:
+            self._x_scale = -self.scale
+            self._x_shift = self.offset[0] + frame_w * self.scale
+        else:
+            self._x_scale = self.scale
+            self._x_shift = self.offset[0]
+        self._y_shift = self.offset[1]
+
+    def matches(self, frame_size, screen_size, mirror):
+        return self.frame_size == frame_size and self.screen_size == screen_size and self.mirror == mirror
+
+    def apply(self, keypoints):
+        """Map an (N, 17, 3) keypoint array to screen pixels (returns a new array)."""
+        mapped = keypoints.copy()
+        mapped[..., 0] = keypoints[..., 0] * self._x_scale + self._x_shift
+        mapped[..., 1] = keypoints[..., 1] * self.scale + self._y_shift
+        return mapped
+
 
 class CameraManager:
-    def __init__(self, screen):
+    def __init__(self, screen, mirror=True):
         self.screen = screen
         self.screen_w, self.screen_h = screen.get_size()
-        self.pose_estimator = PoseEstimator()  # 🔑 load pose model once
+        self.mirror = mirror  # show the camera like a mirror
+        self.transform = None
+
+        # Reused every frame by frame_to_surface (rebuilt with the transform)
+        self._mirror_buffer = None   # mirrored camera frame
+        self._display_pixels = None  # resized BGR pixels backing the display surface
+        self._display_surface = None
+        # 🔑 shared pose model, loaded once per app. It may still be loading in
+        # the background; detect() picks it up once it is ready.
+        self.pose_estimator = acquire_pose_estimator(wait=False)
+        self._holds_estimator = True
+
+    def close(self):
+        """Release this manager's reference to the shared pose model."""
+        if self._holds_estimator:
+            self._holds_estimator = False
+            self.pose_estimator = None
+            release_pose_estimator()
+
+    def get_transform(self, frame):
+        """Cached camera -> screen transform, rebuilt only when the geometry changes."""
+        h, w = frame.shape[:2]
+        screen_size = (self.screen_w, self.screen_h)
+        if self.transform is None or not self.transform.matches((w, h), screen_size, self.mirror):
+            self.transform = FrameTransform((w, h), screen_size, self.mirror)
+            self._display_surface = None
+        return self.transform
 
     def process_frame(self, frame):
-        """Convert an OpenCV frame into a pygame surface + keypoints."""
+        """
+        Convert an OpenCV frame into a pygame surface + keypoints. Keypoints stay
+        in camera-frame pixels; map them with get_transform(frame).apply() to draw.
+        """
         if frame is None:
             return None, None, None
 
-        # Run pose detectionW
-        annotated_frame, keypoints = self.pose_estimator.detect(frame)
+        keypoints = self.detect(frame)
+        surface, offset = self.frame_to_surface(frame)
+        return surface, offset, keypoints
 
-        # Mirror effect
-        annotated_frame = cv2.flip(annotated_frame, 1)
+    def detect(self, frame):
+        """
+        Run pose detection at the estimator's inference size. Keypoints are in
+        camera-frame pixels; map them with get_transform(frame).apply().
+        Finds no humans until the shared model has finished loading.
+        """
+        if self.pose_estimator is None:
+            self.pose_estimator = get_pose_estimator(timeout=0)
+            if self.pose_estimator is None:
+                return empty_keypoints()
+        _, keypoints = self.pose_estimator.detect(frame)
+        return keypoints
 
-        # Keep aspect ratio
-        h, w, _ = annotated_frame.shape
-        scale = min(self.screen_w / w, self.screen_h / h)
-        new_w, new_h = int(w * scale), int(h * scale)
-        frame_resized = cv2.resize(annotated_frame, (new_w, new_h))
+    def frame_to_surface(self, frame):
+        """
+        Mirror, fit and convert a camera frame. Returns (surface, (x_offset, y_offset)).
 
-        # Center the frame
-        x_offset = (self.screen_w - new_w) // 2
-        y_offset = (self.screen_h - new_h) // 2
+        Writes into preallocated buffers and returns the same Surface every
+        call: the Surface wraps the resized pixel buffer directly in BGR
+        order, so there is no colour conversion and no per-frame allocation.
+        Call from the main thread only (pygame Surfaces are not thread-safe).
+        """
+        transform = self.get_transform(frame)
+        if self._display_surface is None:
+            h, w = frame.shape[:2]
+            self._mirror_buffer = np.empty((h, w, 3), dtype=np.uint8)
+            self._display_pixels = np.empty((transform.size[1], transform.size[0], 3), dtype=np.uint8)
+            self._display_surface = pygame.image.frombuffer(self._display_pixels, transform.size, "BGR")
+
+        start = time.perf_counter()
+        # Mirror effect (on the smaller camera frame, before upscaling)
+        if self.mirror:
+            cv2.flip(frame, 1, dst=self._mirror_buffer)
+            frame = self._mirror_buffer
 
-        # Convert to PyGame surface
-        surface = pygame.surfarray.make_surface(np.rot90(frame_resized))
+        # Resize straight into the pixels the display surface is showing
+        cv2.resize(frame, transform.size, dst=self._display_pixels)
+        perf.record("flip_resize", time.perf_counter() - start)
 
-        return surface, (x_offset, y_offset), keypoints
+        return self._display_surface, transform.offset
 
     def get_frame_surface(self, cap):
         # Legacy method: capture frame directly from VideoCapture
@@ -1,4 +1,4 @@
-import pygame
+from assets.asset_manager import scaled_image
 
 BUTTON_DIM = 300  # button width and height
 Y_OFFSET = 20  # distance from bottom of screen
@@ -8,8 +8,7 @@ class CameraToggleButton:
 
     def __init__(self, screen, size=BUTTON_DIM, y_offset=Y_OFFSET):
         self.screen = screen
-        self.original_image = pygame.image.load(IMAGE_PATH).convert_alpha()
-        self.image = pygame.transform.smoothscale(self.original_image, (size, size))
+        self.image = scaled_image(IMAGE_PATH, (size, size))
         self.rect = self.image.get_rect()
         self.rect.midbottom = (screen.get_width() // 2, screen.get_height() - 20)
 
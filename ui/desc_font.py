@@ -9,12 +9,15 @@ class DescFont:
         self.color = color
         self.margin = margin
         self.font = dynapuff(size)
+        # Laid-out paragraphs: (text, width, font, colour) -> one composited surface.
+        # Intro texts never change, so each is wrapped and rendered once.
+        self._blocks = {}
 
-    def render_text(self, text, top_y):
+    def wrap(self, text, max_width):
+        """Split text into lines no wider than max_width pixels"""
         words = text.split(' ')
         lines = []
         current_line = ""
-        max_width = self.screen.get_width() - 2 * self.margin
 
         for word in words:
             test_line = f"{current_line} {word}" if current_line else word
@@ -25,12 +28,28 @@ class DescFont:
                 current_line = word
         if current_line:
             lines.append(current_line)
+        return lines
 
-        y = top_y
-        for line in lines:
-            surf = self.font.render(line, True, self.color)
-            x = self.margin + (max_width - surf.get_width()) // 2  # center within margin
-            self.screen.blit(surf, (x, y))
-            y += self.font.get_linesize()
+    def layout(self, text):
+        """
+        The whole paragraph wrapped to the screen width and rendered into one
+        transparent surface, each line centered. Rebuilt only when the text,
+        width, font or colour changes.
+        """
+        max_width = self.screen.get_width() - 2 * self.margin
+        key = (text, max_width, self.font, self.color)
+        block = self._blocks.get(key)
+        if block is None:
+            lines = [self.font.render(line, True, self.color) for line in self.wrap(text, max_width)]
+            line_h = self.font.get_linesize()
+            block = pygame.Surface((max(max_width, 1), max(line_h * len(lines), 1)), pygame.SRCALPHA)
+            for i, surf in enumerate(lines):
+                block.blit(surf, ((max_width - surf.get_width()) // 2, i * line_h))  # center within margin
+            self._blocks[key] = block
+        return block
 
-        return y 
+    def render_text(self, text, top_y):
+        """Draw the paragraph at top_y (a single blit once laid out); returns the y below it"""
+        block = self.layout(text)
+        self.screen.blit(block, (self.margin, top_y))
+        return top_y + block.get_height()
@@ -0,0 +1,235 @@
+import threading
+import time
+from pose_estimator import PoseResult
+from pose_filter import PoseFilter
+from pose_recording import session_recorder
+from pose_tracker import PoseTracker
+from ui.frame_source import FrameSource, open_frame_source, shared_frame_source
+from ui.inference_scheduler import InferenceScheduler, KeypointPredictor, CPU_BUDGET
+from ui.perf_monitor import perf
+
+class LatestSlot:
+    """
+    Single-slot handoff between pipeline stages. A new item replaces one the
+    consumer has not picked up yet (latest wins) and the replaced item is
+    counted as dropped, so a slow consumer never builds up a backlog.
+    """
+
+    def __init__(self):
+        self._item = None
+        self._cond = threading.Condition()
+        self.delivered = 0
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """Remove and return the newest item, waiting up to `timeout` seconds (None if empty)."""
+        with self._cond:
+            if self._item is None and timeout != 0:
+                self._cond.wait(timeout)
+            item = self._item
+            self._item = None
+            if item is not None:
+                self.delivered += 1
+            return item
+
+    def clear(self):
+        with self._cond:
+            self._item = None
+
+
+class FramePipeline:
+    """
+    Camera pipeline split into stages so that motion-to-feedback latency is
+    bounded by one inference, not by how many frames the driver buffered:
+
+        grabber thread   -> reads the frame source as fast as it delivers, keeps only the newest
+                            frame for display and hands every k-th one to inference
+        inference thread -> takes the newest scheduled frame, runs pose detection,
+                            tracking (stable IDs, patient first) and One-Euro smoothing,
+                            drops anything stale
+        presenter        -> called from draw() on the main thread, turns the newest frame into a
+                            Surface with keypoints predicted for that frame's capture time
+                            (drawing only) and publishes each new inference as a PoseResult
+
+    The InferenceScheduler picks k from measured inference latency, so the
+    preview runs at the camera frame rate while inference stays within budget.
+
+    Published keypoints stay in camera-frame pixels, so the games' pixel
+    thresholds do not change with the window size. `transform` is the
+    FrameTransform the current frame was drawn with; map keypoints through it
+    only to draw them or hit-test them against things on screen.
+    With MOVEQUEST_RECORD_DIR set, every published PoseResult is also recorded
+    (see pose_recording.py) for headless replay.
+    """
+
+    def __init__(self, camera_manager, source=None, cpu_budget=CPU_BUDGET, name="camera"):
+        """
+        source: a FrameSource (webcam, video/image folder, synthetic) or a camera
+            index; defaults to the app-wide shared source, which stays open
+            for a few seconds between sessions (see ui/frame_source.py)
+        name: prefix for session recordings, e.g. the mini-game played
+        """
+        self.camera_manager = camera_manager
+        if source is None:
+            source = shared_frame_source()
+        self.source = source if isinstance(source, FrameSource) else open_frame_source(source)
+        self.name = name
+        self.recorder = None
+        self._record = False
+
+        self.scheduler = InferenceScheduler(cpu_budget)
+        self.tracker = PoseTracker()
+        self.filter = PoseFilter()
+        self.predictor = KeypointPredictor()
+        self.display_slot = LatestSlot()  # grabber -> presenter
+        self.infer_slot = LatestSlot()    # grabber -> inference
+        self._running = False
+        self._threads = []
+
+        # Latest presented output
+        self.surface = None
+        self.offset = (0, 0)
+        self.transform = None  # camera -> screen mapping of the presented frame
+        self.overlay_keypoints = None  # predicted for the presented frame, for drawing only
+        self.result = None     # PoseResult in camera-frame pixels, one per inference
+        self._published = None  # predictor entry self.result was made from
+        self._seq = 0       # never reset, so consumers can keep comparing across sessions
+
+    def is_running(self):
+        return self._running
+
+    def start(self):
+        if self._running:
+            return True
+        if not self._join_threads():
+            print("Camera threads from the last session are still running, not restarting yet")
+            return False
+        if not self.source.open():
+            print(f"Failed to open frame source {self.source.describe()}!")
+            return False
+
+        self.display_slot.clear()
+        self.infer_slot.clear()
+        self.predictor.reset()
+        self._published = None
+        self.overlay_keypoints = None
+        self.filter.reset()
+        self.tracker.reset()  # new session: lock onto whoever is in front of the camera now
+        self._record = True  # the recorder is opened on the first result, once the frame size is known
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._grab_loop, daemon=True),
+            threading.Thread(target=self._inference_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self):
+        self._running = False
+        self._record = False
+        self._join_threads()
+        self.source.pause()  # the shared camera stays open briefly for the next session
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def _join_threads(self, timeout=1.0):
+        """
+        Wait for the stage threads to exit. Threads stuck in a slow read or
+        inference are kept, so start() cannot run a second pair of loops on
+        the same source next to them; returns whether all of them exited.
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        return not self._threads
+
+    # -------------------- Stages --------------------
+    def _grab_loop(self):
+        while self._running:
+            start = time.perf_counter()
+            ret, frame, timestamp = self.source.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            perf.record("capture_read", time.perf_counter() - start)
+            perf.tick("camera")
+
+            self.display_slot.put((frame, timestamp))
+            if self.scheduler.on_frame(timestamp):
+                self.infer_slot.put((frame, timestamp))
+
+    def _inference_loop(self):
+        while self._running:
+            item = self.infer_slot.take(timeout=0.1)
+            if item is None:
+                continue
+            frame, timestamp = item
+            try:
+                start = time.perf_counter()
+                keypoints = self.camera_manager.detect(frame)
+                latency = time.perf_counter() - start
+                self.scheduler.on_inference(latency)
+                perf.record("inference", latency)
+                perf.tick("inference")
+
+                with perf.stage("tracking"):
+                    h, w = frame.shape[:2]
+                    keypoints, track_ids = self.tracker.update(keypoints, (w, h))
+                    keypoints = self.filter.update(timestamp, keypoints, track_ids, self.tracker.live_ids())
+                self.predictor.update(timestamp, keypoints, track_ids)
+            except Exception as e:
+                print(f"Error processing frame: {e}")
+
+    def present(self):
+        """
+        Presenter stage: convert the newest camera frame (if one arrived since
+        the last call) into a Surface, with overlay_keypoints predicted for the
+        moment it was captured. Returns (surface, result).
+
+        A new PoseResult (next seq, the inferred frame's capture timestamp) is
+        published once per finished inference, never for a prediction; until
+        the next one the same result is returned again, so games should step
+        only when result.seq changes.
+        """
+        item = self.display_slot.take(timeout=0)
+        if item is not None:
+            frame, timestamp = item
+            prediction = self.predictor.predict(timestamp)
+            if prediction is not None:
+                self.overlay_keypoints = prediction[0]
+                with perf.stage("surface_conversion"):
+                    self.surface, self.offset = self.camera_manager.frame_to_surface(frame)
+                self.transform = self.camera_manager.get_transform(frame)
+
+        latest = self.predictor.latest()
+        if latest is not None and latest is not self._published and self.transform is not None:
+            self._published = latest
+            timestamp, keypoints, track_ids = latest
+            self._seq += 1
+            self.result = PoseResult(self._seq, timestamp, keypoints, track_ids)
+            if self._record:
+                self._record = False
+                self.recorder = session_recorder(self.transform, self.name)
+            if self.recorder is not None:
+                self.recorder.write(self.result)
+        return self.surface, self.result
+
+    def stats(self):
+        """Handoff counters and scheduler state for the debug overlay"""
+        return {
+            "frames_presented": self.display_slot.delivered,
+            "frames_dropped": self.display_slot.dropped,
+            "frames_inferred": self.infer_slot.delivered,
+            "inference_dropped": self.infer_slot.dropped,
+            "inference_stride": self.scheduler.stride,
+            "inference_ms": (self.scheduler.latency or 0.0) * 1000,
+        }
@@ -0,0 +1,410 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from pose_config import INFERENCE_SIZE
+
+FRAME_SOURCE = os.environ.get("MOVEQUEST_FRAME_SOURCE", "0")  # camera index, video/image folder path, or "synthetic"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# Webcam negotiation
+CAPTURE_MODES = [(320, 240), (640, 480), (960, 540), (1280, 720), (1920, 1080)]  # widely supported, smallest first
+MIN_CAPTURE_WIDTH = 640   # below this the mirrored preview looks blurry on screen
+CAPTURE_SIZE = os.environ.get("MOVEQUEST_CAPTURE_SIZE")  # e.g. "1280x720" to override the negotiated mode
+CAPTURE_FPS = 30
+RECONNECT_FAILURES = 15   # consecutive failed reads before the device counts as disconnected
+RECONNECT_INTERVAL = 2.0  # seconds between reopen attempts while disconnected
+IDLE_RELEASE = float(os.environ.get("MOVEQUEST_CAMERA_IDLE_RELEASE", "5"))  # seconds a paused shared camera stays open
+
+# Standing person drawn by SyntheticSource, camera pixels at 640x480, COCO order (x, y)
+SYNTHETIC_POSE = np.array([
+    (320, 80), (310, 70), (330, 70), (300, 75), (340, 75),     # face
+    (280, 130), (360, 130), (265, 190), (375, 190),            # shoulders, elbows
+    (260, 245), (380, 245), (295, 250), (345, 250),            # wrists, hips
+    (295, 330), (345, 330), (295, 410), (345, 410),            # knees, ankles
+], dtype=np.float32)
+SYNTHETIC_LIMBS = ((5, 6), (5, 11), (6, 12), (11, 12), (5, 7), (7, 9), (6, 8), (8, 10),
+                   (11, 13), (13, 15), (12, 14), (14, 16))
+
+
+class FrameSource:
+    """
+    Where camera frames come from. The pipeline only uses this interface, so a
+    webcam, a recorded clip or generated frames are interchangeable.
+
+    read() returns (ok, frame, timestamp): a BGR uint8 frame and its capture
+    time in seconds. `resolution` (width, height) and `fps` are what the
+    source actually delivers, known after open().
+    """
+
+    resolution = (0, 0)
+    fps = 0.0
+
+    def open(self):
+        """Start delivering frames. Returns False if the source is unavailable."""
+        raise NotImplementedError
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def pause(self):
+        """Stop reading for now. Sources without a cheaper way to idle just close."""
+        self.release()
+
+    def flush(self):
+        """Drop anything the source buffered while nobody was reading"""
+        pass
+
+    def is_opened(self):
+        return False
+
+    def describe(self):
+        w, h = self.resolution
+        return f"{type(self).__name__} {w}x{h} @ {self.fps:.0f} fps"
+
+
+def capture_mode(inference_size=INFERENCE_SIZE):
+    """
+    Smallest common webcam mode that still covers the model input and gives a
+    sharp enough preview; bigger frames only cost USB bandwidth, decoding and
+    resizing, since inference downscales them anyway.
+    """
+    if CAPTURE_SIZE:
+        w, h = CAPTURE_SIZE.lower().split("x")
+        return int(w), int(h)
+    for w, h in CAPTURE_MODES:
+        if w >= max(inference_size, MIN_CAPTURE_WIDTH):
+            return w, h
+    return CAPTURE_MODES[-1]
+
+
+class WebcamSource(FrameSource):
+    """
+    A live camera through cv2.VideoCapture. open() negotiates the capture
+    format instead of taking driver defaults (often full resolution YUYV with
+    several buffered frames): the capture_mode() size, CAPTURE_FPS, MJPG and
+    a one-frame buffer so every read is the newest frame. The values the
+    driver actually accepted are read back into resolution/fps/fourcc.
+
+    If the device disconnects, read() keeps returning no frame and reopens it
+    every RECONNECT_INTERVAL seconds until it is back.
+    """
+
+    def __init__(self, index=0, size=None, fps=CAPTURE_FPS):
+        self.index = index
+        self.requested_size = size or capture_mode()
+        self.requested_fps = fps
+        self.fourcc = ""
+        self.cap = None
+        self.reconnects = 0
+        self._failures = 0
+        self._last_attempt = 0.0
+
+    def open(self):
+        self._last_attempt = time.time()
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            self.cap = None
+            return False
+
+        w, h = self.requested_size
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+        self.cap.set(cv2.CAP_PROP_FPS, self.requested_fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.resolution = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or float(self.requested_fps)
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.fourcc = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\0")
+        self._failures = 0
+        return True
+
+    def read(self):
+        if self.cap is None:
+            self._reconnect()
+            return False, None, time.time()
+
+        ret, frame = self.cap.read()
+        if ret:
+            self._failures = 0
+        else:
+            self._failures += 1
+            if self._failures >= RECONNECT_FAILURES:
+                self._reconnect()
+        return ret, frame, time.time()
+
+    def _reconnect(self):
+        """Reopen an unplugged/crashed device, at most once per RECONNECT_INTERVAL."""
+        if time.time() - self._last_attempt < RECONNECT_INTERVAL:
+            return
+        print(f"Camera {self.index} lost, reconnecting")
+        self.release()
+        if self.open():
+            self.reconnects += 1
+            print(f"Camera {self.index} reconnected: {self.describe()}")
+
+    def flush(self):
+        if self.cap is not None:
+            self.cap.grab()
+
+    def release(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+        self.cap = None
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def describe(self):
+        return f"{super().describe()} {self.fourcc}".rstrip()
+
+
+class _PacedSource(FrameSource):
+    """
+    Base for sources that are not a live device. realtime=True delivers frames
+    at `fps` on the wall clock (demo kiosks); realtime=False delivers them as
+    fast as they are read, with timestamps advancing exactly 1/fps per frame
+    so a run is deterministic (throughput tests).
+    """
+
+    def __init__(self, fps, realtime):
+        self.fps = fps
+        self.realtime = realtime
+        self._opened = False
+        self._index = 0
+        self._start = None
+
+    def _next_timestamp(self):
+        if self._start is None:
+            self._start = time.time()
+        timestamp = self._start + self._index / self.fps
+        self._index += 1
+        if self.realtime:
+            delay = timestamp - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        return timestamp
+
+    def is_opened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+
+class VideoFileSource(_PacedSource):
+    """Frames from a video file or a directory of images, optionally looping"""
+
+    def __init__(self, path, fps=None, loop=True, realtime=True):
+        super().__init__(fps or 30.0, realtime)
+        self.path = path
+        self.loop = loop
+        self.cap = None
+        self.images = None
+
+    def open(self):
+        if os.path.isdir(self.path):
+            self.images = sorted(os.path.join(self.path, name) for name in os.listdir(self.path)
+                                 if name.lower().endswith(IMAGE_EXTENSIONS))
+            if not self.images:
+                return False
+            first = cv2.imread(self.images[0])
+            if first is None:
+                return False
+            self.resolution = (first.shape[1], first.shape[0])
+        else:
+            self.cap = cv2.VideoCapture(self.path)
+            if not self.cap.isOpened():
+                self.cap = None
+                return False
+            self.resolution = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or self.fps
+        self._opened = True
+        self._index = 0
+        self._start = None
+        return True
+
+    def _read_frame(self):
+        if self.images is not None:
+            position = self._index % len(self.images) if self.loop else self._index
+            if position >= len(self.images):
+                return None
+            return cv2.imread(self.images[position])
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def read(self):
+        frame = self._read_frame()
+        if frame is None:
+            return False, None, time.time()
+        return True, frame, self._next_timestamp()
+
+    def release(self):
+        super().release()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class SyntheticSource(_PacedSource):
+    """
+    Generated frames: a noisy gradient background with a stick figure
+    marching in place. No files or devices needed.
+    """
+
+    def __init__(self, resolution=(640, 480), fps=30.0, realtime=True, seed=0):
+        super().__init__(fps, realtime)
+        self.resolution = resolution
+        self.seed = seed
+        self._background = None
+        self._frame = None
+
+    def open(self):
+        w, h = self.resolution
+        rng = np.random.default_rng(self.seed)
+        self._background = np.empty((h, w, 3), dtype=np.uint8)
+        self._background[...] = np.linspace(40, 200, w, dtype=np.uint8)[None, :, None]
+        self._background += rng.integers(0, 20, self._background.shape, dtype=np.uint8)
+        self._frame = np.empty_like(self._background)
+        self._opened = True
+        self._index = 0
+        self._start = None
+        return True
+
+    def pose(self, index):
+        """Ground-truth joint positions (17, 2) drawn in frame `index`"""
+        w, h = self.resolution
+        points = SYNTHETIC_POSE * (w / 640, h / 480)
+        lifted = 13 + (index // 10) % 2  # knees take turns every 10 frames
+        points[[lifted, lifted + 2], 1] -= 60 * h / 480
+        return points
+
+    def read(self):
+        index = self._index
+        points = self.pose(index).astype(np.int32)
+        np.copyto(self._frame, self._background)
+        cv2.circle(self._frame, tuple(points[0]), 30, (90, 140, 200), -1)
+        for a, b in SYNTHETIC_LIMBS:
+            cv2.line(self._frame, tuple(points[a]), tuple(points[b]), (60, 60, 160), 18)
+        # The pipeline hands frames to other threads, so each read gets its own copy
+        return True, self._frame.copy(), self._next_timestamp()
+
+
+def open_frame_source(spec=None):
+    """
+    Build a FrameSource from a spec: a camera index ("0"), "synthetic", or a
+    path to a video file or image directory. Defaults to MOVEQUEST_FRAME_SOURCE.
+    """
+    spec = FRAME_SOURCE if spec is None else str(spec)
+    if spec.isdigit():
+        return WebcamSource(int(spec))
+    if spec == "synthetic":
+        return SyntheticSource()
+    return VideoFileSource(spec)
+
+
+class SharedFrameSource(FrameSource):
+    """
+    App-wide owner of one FrameSource. Pipelines open and pause it as the user
+    toggles the camera and moves between screens. Once nobody is reading, the
+    device stays open (and negotiated) for another `idle_release` seconds, so
+    turning the camera back on or moving to the next mini-game is instant
+    instead of a one-to-three second reopen; after that it is released (the
+    webcam light goes off) and reopened on the next open().
+    """
+
+    def __init__(self, source, idle_release=IDLE_RELEASE):
+        self.source = source
+        self.idle_release = idle_release
+        self._lock = threading.Lock()
+        self._users = 0          # pipelines between open() and pause()
+        self._idle_timer = None
+
+    @property
+    def resolution(self):
+        return self.source.resolution
+
+    @property
+    def fps(self):
+        return self.source.fps
+
+    def open(self):
+        with self._lock:
+            self._cancel_idle_release()
+            if self.source.is_opened():
+                self.source.flush()  # resume: skip the frame that sat in the buffer while paused
+                opened = True
+            else:
+                opened = self.source.open()
+            if opened:
+                self._users += 1
+            return opened
+
+    def read(self):
+        return self.source.read()
+
+    def pause(self):
+        """Keep the device warm for a while; release it if nobody opens it again in time"""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users or not self.source.is_opened():
+                return
+            self._cancel_idle_release()
+            timer = threading.Timer(self.idle_release, self._release_if_idle)
+            timer.args = (timer,)
+            timer.daemon = True
+            self._idle_timer = timer
+            timer.start()
+
+    def _release_if_idle(self, timer):
+        with self._lock:
+            if self._users == 0 and self._idle_timer is timer:  # not cancelled or replaced meanwhile
+                self._idle_timer = None
+                self.source.release()
+
+    def _cancel_idle_release(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def release(self):
+        with self._lock:
+            self._cancel_idle_release()
+            self._users = 0
+            self.source.release()
+
+    def is_opened(self):
+        return self.source.is_opened()
+
+    def describe(self):
+        return self.source.describe()
+
+
+_shared_source = None
+_shared_lock = threading.Lock()
+
+def shared_frame_source():
+    """The app-wide frame source (MOVEQUEST_FRAME_SOURCE), created on first use"""
+    global _shared_source
+    with _shared_lock:
+        if _shared_source is None:
+            _shared_source = SharedFrameSource(open_frame_source())
+        return _shared_source
+
+def shutdown_frame_source():
+    """Release the camera at app exit"""
+    global _shared_source
+    with _shared_lock:
+        if _shared_source is not None:
+            _shared_source.release()
+        _shared_source = None
@@ -0,0 +1,108 @@
+import math
+import threading
+import numpy as np
+
+CPU_BUDGET = 0.5          # fraction of one core pose inference may use
+MAX_PREDICTION = 0.25     # seconds keypoints may be extrapolated past the last inference
+EMA_ALPHA = 0.2           # smoothing for latency / frame-interval estimates
+
+class InferenceScheduler:
+    """
+    Decides which camera frames get a full pose inference. Measures inference
+    latency and the camera's frame interval, and runs inference every k-th
+    frame with k chosen so inference stays within CPU_BUDGET.
+    """
+
+    def __init__(self, cpu_budget=CPU_BUDGET):
+        self.cpu_budget = cpu_budget
+        self.latency = None         # seconds per inference (EMA)
+        self.frame_interval = None  # seconds between camera frames (EMA)
+        self.stride = 1             # k: infer every k-th frame
+        self._last_frame_time = None
+        self._frames_since_inference = 0
+
+    def _ema(self, current, sample):
+        return sample if current is None else current + EMA_ALPHA * (sample - current)
+
+    def on_frame(self, timestamp):
+        """Call for every captured frame. Returns True if this frame should be inferred."""
+        if self._last_frame_time is not None:
+            self.frame_interval = self._ema(self.frame_interval, timestamp - self._last_frame_time)
+        self._last_frame_time = timestamp
+
+        self._frames_since_inference += 1
+        if self._frames_since_inference >= self.stride:
+            self._frames_since_inference = 0
+            return True
+        return False
+
+    def on_inference(self, latency):
+        """Call after every inference with how long it took."""
+        self.latency = self._ema(self.latency, latency)
+        if self.frame_interval:
+            # Inference time per frame shown must fit in the budget
+            self.stride = max(1, math.ceil(self.latency / (self.cpu_budget * self.frame_interval)))
+
+
+class KeypointPredictor:
+    """
+    Fills the frames between inferences. Keeps the last two inference results
+    and forward-predicts every joint from their velocity, so the skeleton
+    overlay gets a smooth keypoint stream at the camera frame rate. Games use
+    the inference results themselves (latest()), never a prediction.
+    Velocity is only used when both results hold the same tracked people.
+    """
+
+    def __init__(self, max_prediction=MAX_PREDICTION, conf_threshold=0.5):
+        self.max_prediction = max_prediction
+        self.conf_threshold = conf_threshold
+        self._previous = None  # (timestamp, keypoints, track_ids)
+        self._latest = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._previous = None
+            self._latest = None
+
+    def update(self, timestamp, keypoints, track_ids):
+        """Record a fresh (tracked) inference result for the frame captured at `timestamp`."""
+        with self._lock:
+            self._previous = self._latest
+            self._latest = (timestamp, keypoints, track_ids)
+
+    def latest(self):
+        """The newest inference result as (timestamp, keypoints, track_ids), or None"""
+        with self._lock:
+            return self._latest
+
+    def predict(self, timestamp):
+        """
+        (keypoints, track_ids) for a frame captured at `timestamp`, or None
+        before the first inference.
+        """
+        with self._lock:
+            previous, latest = self._previous, self._latest
+        if latest is None:
+            return None
+
+        t1, kp1, ids1 = latest
+        if previous is None:
+            return kp1, ids1
+        t0, kp0, ids0 = previous
+
+        # People appeared or left: no velocity to extrapolate from
+        if not np.array_equal(ids0, ids1) or t1 <= t0 or len(kp1) == 0:
+            return kp1, ids1
+
+        horizon = min(max(timestamp - t1, 0.0), self.max_prediction)
+        if horizon == 0.0:
+            return kp1, ids1
+
+        predicted = kp1.copy()
+        velocity = (kp1[..., :2] - kp0[..., :2]) / (t1 - t0)
+        # Joints that were unreliable in either result are held, not extrapolated
+        reliable = np.minimum(kp0[..., 2], kp1[..., 2]) >= self.conf_threshold
+        velocity[~reliable] = 0.0
+        predicted[..., :2] += velocity * horizon
+        return predicted, ids1
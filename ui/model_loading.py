@@ -0,0 +1,58 @@
+import pygame
+from assets.fonts import default_font, dynapuff
+from pose_estimator import pose_estimator_status, retry_pose_estimator
+from ui.buttons import Button
+from ui.text_cache import render_text
+
+TEXT_COLOR = (255, 255, 255)
+BAR_BACKGROUND = (100, 100, 100)
+BAR_COLOR = (0, 255, 0)
+BAR_SIZE = (400, 20)
+
+class ModelLoadingIndicator:
+    """
+    "Loading pose model" message with a progress bar, shown by camera screens
+    while the shared model is still loading and warming up in the background.
+    If loading failed it shows the error and a Retry button instead; pass
+    clicks to handle_event().
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.font = dynapuff(40)
+        self.error_font = default_font(24)
+        self.text = self.font.render("Loading pose model...", True, TEXT_COLOR)
+        self.failed_text = self.font.render("Couldn't load the pose model", True, TEXT_COLOR)
+        center_x, center_y = screen.get_width() // 2, screen.get_height() // 2
+        self.retry_button = Button(screen, text="Retry", pos=(center_x, center_y + 110), size=(200, 70))
+        self.showing_error = False
+
+    def draw(self):
+        """Draw the message if the model is not ready yet; returns whether it drew."""
+        ready, progress, error = pose_estimator_status()
+        self.showing_error = error is not None
+        if ready:
+            return False
+
+        center_x, center_y = self.screen.get_width() // 2, self.screen.get_height() // 2
+        if error is not None:
+            self.screen.blit(self.failed_text, self.failed_text.get_rect(center=(center_x, center_y)))
+            detail = render_text(self.error_font, error, TEXT_COLOR)
+            self.screen.blit(detail, detail.get_rect(midtop=(center_x, center_y + 35)))
+            self.retry_button.draw()
+            return True
+
+        self.screen.blit(self.text, self.text.get_rect(center=(center_x, center_y)))
+        bar = pygame.Rect(0, 0, *BAR_SIZE)
+        bar.midtop = (center_x, center_y + 40)
+        pygame.draw.rect(self.screen, BAR_BACKGROUND, bar)
+        pygame.draw.rect(self.screen, BAR_COLOR, (bar.x, bar.y, int(bar.width * progress), bar.height))
+        return True
+
+    def handle_event(self, event, mouse_pos):
+        """Start loading again when Retry is clicked; returns whether the event was used."""
+        if (self.showing_error and event.type == pygame.MOUSEBUTTONDOWN and
+                self.retry_button.is_clicked(mouse_pos)):
+            self.showing_error = False
+            return retry_pose_estimator()
+        return False
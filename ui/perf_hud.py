@@ -0,0 +1,63 @@
+import pygame
+from assets.asset_manager import assets
+from assets.fonts import default_font
+from ui.perf_monitor import perf, STAGES
+
+PANEL_COLOR = (0, 0, 0, 170)
+TEXT_COLOR = (255, 255, 255)
+WARN_COLOR = (255, 200, 0)
+FRAME_BUDGET_MS = 1000 / 30   # a stage slower than one frame at 30 fps is highlighted
+REFRESH_MS = 500              # numbers are recomputed twice a second, not every frame
+
+class PerfHud:
+    """
+    Performance page drawn on top of any screen (toggle with 'P'): live fps
+    of the render loop, camera and inference, asset cache memory, and
+    p50/p95/p99 per pipeline stage from the PerfMonitor ring buffers.
+    """
+
+    def __init__(self, screen, monitor=perf):
+        self.screen = screen
+        self.monitor = monitor
+        self.visible = False
+        self.font = default_font(22)
+        self._panel = None
+        self._last_refresh = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._panel = None
+
+    def _build_panel(self):
+        lines = []
+        fps = "   ".join(f"{name} {self.monitor.fps(name):5.1f}" for name in ("render", "camera", "inference"))
+        lines.append((f"fps   {fps}", TEXT_COLOR))
+        usage = assets.memory_usage()
+        lines.append((f"assets {usage['bytes'] / 2**20:.1f} / {usage['budget'] / 2**20:.0f} MB in {usage['entries']} surfaces"
+                      f" ({usage['evictions']} evicted)", TEXT_COLOR))
+        lines.append((f"{'stage':20s}{'p50':>8s}{'p95':>8s}{'p99':>8s}  ms", TEXT_COLOR))
+        summary = self.monitor.summary()
+        for name in STAGES + [s for s in summary if s not in STAGES]:
+            row = summary.get(name)
+            if row is None:
+                continue
+            color = WARN_COLOR if row["p95_ms"] > FRAME_BUDGET_MS else TEXT_COLOR
+            lines.append((f"{name:20s}{row['p50_ms']:8.2f}{row['p95_ms']:8.2f}{row['p99_ms']:8.2f}", color))
+
+        rendered = [self.font.render(text, True, color) for text, color in lines]
+        line_h = self.font.get_linesize()
+        width = max(s.get_width() for s in rendered) + 20
+        panel = pygame.Surface((width, line_h * len(rendered) + 20), pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+        for i, surface in enumerate(rendered):
+            panel.blit(surface, (10, 10 + i * line_h))
+        return panel
+
+    def draw(self):
+        if not self.visible:
+            return
+        now = pygame.time.get_ticks()
+        if self._panel is None or now - self._last_refresh >= REFRESH_MS:
+            self._panel = self._build_panel()
+            self._last_refresh = now
+        self.screen.blit(self._panel, (self.screen.get_width() - self._panel.get_width() - 10, 10))
@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+import platform
+import time
+from contextlib import contextmanager
+import numpy as np
+
+WINDOW = 300   # samples kept per stage (about 10 s at 30 fps)
+PERF_DIR = os.environ.get("MOVEQUEST_PERF_DIR")  # set to dump each session's timings here on exit
+
+# Pipeline stages in the order they happen to a frame
+STAGES = [
+    "capture_read",        # cap.read() in the grabber thread
+    "inference",           # pose model on one frame
+    "tracking",            # tracker + One-Euro filter
+    "flip_resize",         # mirror and fit the frame to the screen
+    "surface_conversion",  # frame -> display Surface, flip_resize included
+    "annotation",          # skeleton overlay
+    "game_logic",          # one game step on a new pose result
+    "draw",                # the current screen's draw()
+    "display_flip",        # pygame.display.update()
+]
+
+
+class RingBuffer:
+    """Fixed-size float ring buffer; only the newest WINDOW samples are kept."""
+
+    def __init__(self, size=WINDOW):
+        self._values = np.zeros(size, dtype=np.float64)
+        self._next = 0
+        self.count = 0  # total samples ever added
+
+    def add(self, value):
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self.count += 1
+
+    def values(self):
+        """Copy of the samples currently held (oldest first is not guaranteed)"""
+        return self._values[:min(self.count, len(self._values))].copy()
+
+
+class PerfMonitor:
+    """
+    Always-on per-stage timers. Every stage writes durations into its own
+    fixed-size ring buffer and every rate counter (render loop, camera,
+    inference) records its tick intervals, so the cost is one perf_counter()
+    pair and an array store per measurement, with no allocation.
+
+    Each stage is written by one thread only; readers copy the buffers, so a
+    sample that is being overwritten can at worst be off by one frame.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.stages = {name: RingBuffer(window) for name in STAGES}
+        self.rates = {}
+        self._last_tick = {}
+        self.started = time.time()
+
+    def record(self, stage, seconds):
+        buffer = self.stages.get(stage)
+        if buffer is None:
+            buffer = self.stages[stage] = RingBuffer(self.window)
+        buffer.add(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def tick(self, name):
+        """Count one event of a rate (e.g. a rendered frame) for the fps readout."""
+        now = time.perf_counter()
+        last = self._last_tick.get(name)
+        self._last_tick[name] = now
+        if last is not None:
+            buffer = self.rates.get(name)
+            if buffer is None:
+                buffer = self.rates[name] = RingBuffer(self.window)
+            buffer.add(now - last)
+
+    def fps(self, name):
+        buffer = self.rates.get(name)
+        if buffer is None or buffer.count == 0:
+            return 0.0
+        mean = float(buffer.values().mean())
+        return 1.0 / mean if mean > 0 else 0.0
+
+    def summary(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} for stages with samples"""
+        summary = {}
+        for name, buffer in self.stages.items():
+            if buffer.count == 0:
+                continue
+            values = buffer.values() * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            summary[name] = {
+                "count": buffer.count,
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(values.max()),
+            }
+        return summary
+
+    def dump(self, directory=PERF_DIR):
+        """
+        Write the session's numbers to <directory>/perf-<time>.json and .csv so
+        runs on different machines can be compared. Returns the JSON path, or
+        None when no directory is given (MOVEQUEST_PERF_DIR unset).
+        """
+        if not directory:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("perf-%Y%m%d-%H%M%S"))
+        summary = self.summary()
+        report = {
+            "machine": {
+                "system": platform.system(),
+                "release": platform.release(),
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "python": platform.python_version(),
+            },
+            "session_seconds": time.time() - self.started,
+            "fps": {name: self.fps(name) for name in self.rates},
+            "stages": summary,
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(report, f, indent=2)
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            for name, row in summary.items():
+                writer.writerow([name, row["count"]] + [f"{row[key]:.3f}" for key in
+                                                         ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")])
+        return base + ".json"
+
+
+# One monitor for the whole app, shared by the pipeline threads and the UI
+perf = PerfMonitor()
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+import pygame
+from ui.perf_monitor import perf
+
+# COCO skeleton: pairs of keypoint indices joined by a limb
+COCO_EDGES = np.array([
+    (15, 13), (13, 11), (16, 14), (14, 12),  # legs
+    (11, 12), (5, 11), (6, 12), (5, 6),      # torso
+    (5, 7), (6, 8), (7, 9), (8, 10),         # arms
+    (1, 2), (0, 1), (0, 2), (1, 3), (2, 4),  # face
+    (3, 5), (4, 6),                          # ears to shoulders
+])
+
+LEG_COLOR = (255, 128, 0)
+TORSO_COLOR = (255, 51, 255)
+ARM_COLOR = (51, 153, 255)
+FACE_COLOR = (0, 255, 0)
+EDGE_COLORS = [LEG_COLOR] * 4 + [TORSO_COLOR] * 4 + [ARM_COLOR] * 4 + [FACE_COLOR] * 7
+JOINT_COLOR = (255, 255, 255)
+
+class SkeletonRenderer:
+    """Draws pose skeletons straight onto a pygame surface from a keypoint array."""
+
+    def __init__(self, screen, conf_threshold=0.5, line_width=4, joint_radius=6):
+        self.screen = screen
+        self.conf_threshold = conf_threshold
+        self.line_width = line_width
+        self.joint_radius = joint_radius
+
+    def draw(self, keypoints, transform=None):
+        """
+        keypoints: (N, 17, 3) array in camera-frame pixels
+        transform: the FrameTransform the camera frame was drawn with (mirror,
+            scale and letterbox offset), so the skeleton lands on the person in
+            the video; None draws the keypoints as they are
+        """
+        if keypoints is None or len(keypoints) == 0:
+            return
+        start = time.perf_counter()
+
+        # Map every joint to screen space in one step
+        if transform is not None:
+            keypoints = transform.apply(keypoints)
+        points = keypoints[..., :2].astype(np.int32)
+        visible = keypoints[..., 2] >= self.conf_threshold
+
+        # A limb is drawn only when both of its joints are confident
+        edge_visible = visible[:, COCO_EDGES[:, 0]] & visible[:, COCO_EDGES[:, 1]]
+
+        points = points.tolist()
+        for human, edge in zip(*np.nonzero(edge_visible)):
+            a, b = COCO_EDGES[edge]
+            pygame.draw.line(self.screen, EDGE_COLORS[edge], points[human][a], points[human][b], self.line_width)
+
+        for human, joint in zip(*np.nonzero(visible)):
+            pygame.draw.circle(self.screen, JOINT_COLOR, points[human][joint], self.joint_radius)
+        perf.record("annotation", time.perf_counter() - start)
@@ -0,0 +1,34 @@
+class StaticScreen:
+    """
+    Base for menu screens whose picture only changes on navigation. Every
+    screen's draw() reports what it changed so the main loop can present
+    only that, or nothing at all and sleep until the next event:
+
+        None           -> the whole screen was repainted
+        []             -> nothing changed since the last draw()
+        [Rect, ...]    -> only these areas changed
+
+    Subclasses implement paint() (the full picture) and may override
+    update() to repaint small changing parts and return their rects. The
+    main loop calls invalidate() whenever the display needs a full repaint
+    (screen switch, window exposed, overlay on top).
+    """
+
+    def __init__(self):
+        self._dirty = True
+
+    def invalidate(self):
+        self._dirty = True
+
+    def draw(self):
+        if not self._dirty:
+            return self.update()
+        self._dirty = False
+        self.paint()
+        return None
+
+    def paint(self):
+        raise NotImplementedError
+
+    def update(self):
+        return []
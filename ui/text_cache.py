@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 256  # rendered strings kept; debug lines with changing numbers cycle through
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text Surfaces keyed by (text, font, colour).
+    Labels that do not change (instructions, "Score: 3" until the score moves)
+    are rendered once and blitted from the cache on every later frame.
+    Returned Surfaces are shared: blit them, never draw into them.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self._surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+
+        surface = font.render(text, antialias, color)
+        with self._lock:
+            self.misses += 1
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+
+
+# One cache for the whole app
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """font.render(text, antialias, color), served from the shared cache when unchanged"""
+    return text_cache.render(font, text, color, antialias)
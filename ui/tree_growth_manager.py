@@ -1,15 +1,37 @@
-import pygame
 import random
+import threading
+from assets.asset_manager import load_image, scaled_image
+
+TREE_PATHS = ["assets/trees/tree_a.png", "assets/trees/tree_b.png", "assets/trees/tree_c.png"]
+GROWTH_STEPS = 64      # pre-scaled frames between half and full height
+SKINNY_FACTOR = 0.3    # trees are drawn at this fraction of their original width
+
+# Growth frames are scaled variants in the shared asset cache, so they count
+# against its memory budget and are rebuilt on demand after eviction. Every
+# new tree pre-scales its frames on a thread, unless one for the same
+# (image, screen size) is still running; frames still cached are just hits.
+_prefetches = {}  # (path, screen size) -> latest prefetch thread
+_prefetch_lock = threading.Lock()
+
+def growth_size(image, screen_size, step):
+    """Size of the tree at growth `step`: height from 0.5 * screen_h to screen_h, skinny width"""
+    screen_h = screen_size[1]
+    min_h = int(screen_h * 0.5)
+    new_h = int(min_h + (screen_h - min_h) * step / (GROWTH_STEPS - 1))
+    return int(image.get_width() * SKINNY_FACTOR), new_h
+
+def _prefetch_growth_frames(path, sizes):
+    for size in sizes:
+        scaled_image(path, size)
+
 
 class TreeGrowthManager:
     def __init__(self, screen_size):
         self.screen_w, self.screen_h = screen_size
-        self.tree_images = [
-            pygame.image.load("assets/trees/tree_a.png").convert_alpha(),
-            pygame.image.load("assets/trees/tree_b.png").convert_alpha(),
-            pygame.image.load("assets/trees/tree_c.png").convert_alpha()
-        ]
+        self.tree_images = [load_image(path) for path in TREE_PATHS]
         self.current_tree = None
+        self.current_path = None
+        self.prefetch = None  # thread pre-scaling the current tree's growth frames
         self.current_pos = None
         self.progress = 0.0   # 0.0 = half height, 1.0 = full height
         self.active = False
@@ -23,7 +45,10 @@ class TreeGrowthManager:
         if self.active:
             return
 
-        self.current_tree = random.choice(self.tree_images)
+        index = random.randrange(len(self.tree_images))
+        self.current_tree = self.tree_images[index]
+        self.current_path = TREE_PATHS[index]
+        self.prefetch = self.prefetch_growth_frames(index)
         
         # Choose left or right edge
         side = random.choice(["left", "right"])
@@ -36,6 +61,24 @@ class TreeGrowthManager:
         self.finished = False
         self.countdown_finished = False
 
+    def prefetch_growth_frames(self, index):
+        """
+        Start scaling all GROWTH_STEPS frames of tree `index` at this screen
+        size into the asset cache, re-scaling frames evicted since the last
+        prefetch; draw() scales any frame it needs before the thread got to
+        it. Returns the prefetch thread.
+        """
+        screen_size = (self.screen_w, self.screen_h)
+        key = (TREE_PATHS[index], screen_size)
+        with _prefetch_lock:
+            thread = _prefetches.get(key)
+            if thread is None or not thread.is_alive():
+                sizes = [growth_size(self.tree_images[index], screen_size, step) for step in range(GROWTH_STEPS)]
+                thread = _prefetches[key] = threading.Thread(target=_prefetch_growth_frames,
+                                                             args=(TREE_PATHS[index], sizes), daemon=True)
+                thread.start()
+        return thread
+
     def update(self, seconds_left, hold_time):
         """Update growth based on countdown"""
         if not self.active or self.finished:
@@ -56,20 +99,10 @@ class TreeGrowthManager:
         if not self.active or self.current_tree is None:
             return
 
-        # Original size
-        tree_w, tree_h = self.current_tree.get_size()
-
-        # Height goes from 0.5 * screen_h → 1.0 * screen_h
-        min_h = int(self.screen_h * 0.5)
-        max_h = self.screen_h
-        new_h = int(min_h + (max_h - min_h) * self.progress)
-
-        # Make tree skinnier: scale width to 50%-70% of original
-        skinny_factor = 0.3 
-        new_w = int(tree_w * skinny_factor)
-
-        # Scale the tree
-        scaled_tree = pygame.transform.smoothscale(self.current_tree, (new_w, new_h))
+        # Height goes from 0.5 * screen_h → 1.0 * screen_h, in GROWTH_STEPS steps
+        step = round(self.progress * (GROWTH_STEPS - 1))
+        scaled_tree = scaled_image(self.current_path, growth_size(self.current_tree, (self.screen_w, self.screen_h), step))
+        new_w, new_h = scaled_tree.get_size()
 
         # Align bottom
         x, y_bottom = self.current_pos
@@ -83,6 +116,7 @@ class TreeGrowthManager:
     def reset(self):
         self.active = False
         self.current_tree = None
+        self.current_path = None
         self.progress = 0.0
         self.finished = False
         self.countdown_finished = False